@@ -4,10 +4,21 @@ import base64
 import requests
 import datetime
 import os
+import functools
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.asymmetric import padding
 from cryptography.hazmat.primitives import serialization
 
+# orjson decodes API payloads several times faster than stdlib json
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
 # --- IMPORTS ---
 import env
 
@@ -18,10 +29,38 @@ except ImportError:
     print("⚠️ Warning: 'research_markets.py' not found. AI updates will be disabled.")
 
 # --- CONFIGURATION & AUTH ---
+KALSHI_BASE_URL = "https://api.elections.kalshi.com"
+API_PREFIX = "/trade-api/v2"
+MARKETS_URL = KALSHI_BASE_URL + API_PREFIX + "/markets"
+COMMON_HEADERS = { "Content-Type": "application/json" }
+
+MARKET_FETCH_WORKERS = 10 # Max concurrent market lookups (keeps us polite with Kalshi)
+MARKET_CACHE_TTL = 30     # Seconds a fetched market record is reused before re-fetching
+MARKET_CACHE_SIZE = 512
+REQUEST_TIMEOUT = (3, 10) # (connect, read) seconds, so a stalled lookup can't hang the report
 
+market_cache = {} # ticker -> (fetched_at, market dict)
+
+# Shared HTTP session: keeps TLS connections alive across every Kalshi call
+session = requests.Session()
+session.mount("https://", HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=64,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+))
+
+# Signing parameters never change, so build them once instead of per request
+PSS_PADDING = padding.PSS(
+    mgf=padding.MGF1(hashes.SHA256()),
+    salt_length=padding.PSS.MAX_LENGTH
+)
+SIGNING_HASH = hashes.SHA256()
+
+@functools.lru_cache(maxsize=1)
 def get_private_key():
     """
     Loads the private key from the file path defined in env.py.
+    Cached: the PEM is read and parsed once per process, not on every signature.
     """
     key_path = getattr(env, 'KALSHI_PRIVATE_KEY_PATH', 'BaddieBot.txt')
     
@@ -42,24 +81,18 @@ def get_private_key():
 
 def sign_request(method, path):
     """Generates the RSA signature using the local private key."""
-    timestamp = str(int(time.time() * 1000))
-    msg_string = timestamp + method + path
+    timestamp_ms = int(time.time() * 1000)
+    # Build the signed message straight as bytes (API paths are plain ASCII)
+    msg = b"%d%s%s" % (timestamp_ms, method.encode('ascii'), path.encode('ascii'))
 
     private_key = get_private_key()
-    signature = private_key.sign(
-        msg_string.encode('utf-8'),
-        padding.PSS(
-            mgf=padding.MGF1(hashes.SHA256()),
-            salt_length=padding.PSS.MAX_LENGTH
-        ),
-        hashes.SHA256()
-    )
-    return timestamp, base64.b64encode(signature).decode('utf-8')
+    signature = private_key.sign(msg, PSS_PADDING, SIGNING_HASH)
+
+    return str(timestamp_ms), base64.b64encode(signature).decode('ascii')
 
 def make_authenticated_request(method, endpoint, params=None):
     """Sends signed requests using credentials."""
-    base_url = "https://api.elections.kalshi.com" 
-    path = '/trade-api/v2' + endpoint
+    path = API_PREFIX + endpoint
     
     try:
         timestamp, signature = sign_request(method, path)
@@ -68,26 +101,82 @@ def make_authenticated_request(method, endpoint, params=None):
         return None
 
     headers = {
+        **COMMON_HEADERS,
         "KALSHI-ACCESS-KEY": env.KALSHI_KEY_ID,
         "KALSHI-ACCESS-SIGNATURE": signature,
-        "KALSHI-ACCESS-TIMESTAMP": timestamp,
-        "Content-Type": "application/json"
+        "KALSHI-ACCESS-TIMESTAMP": timestamp
     }
 
-    url = f"{base_url}{path}"
+    url = KALSHI_BASE_URL + path
     
     try:
-        response = requests.request(method, url, headers=headers, params=params)
+        response = session.request(method, url, headers=headers, params=params)
         if response.status_code == 401:
             print("❌ Error 401: Unauthorized. Check your API Key ID and Private Key.")
             return None
-        return response.json()
+        response.raise_for_status()
+        return json_loads(response.content)
+    except requests.HTTPError as e:
+        # Only touch the body on the error path, and keep the log bounded
+        print(f"❌ Request Failed: {e}")
+        print(f"   Response Body: {e.response.content[:512]!r}")
+        return None
     except Exception as e:
         print(f"❌ Request Failed: {e}")
         return None
 
 # --- PORTFOLIO LOGIC ---
 
+def get_cached_market(ticker):
+    """Returns the cached market record if it is still fresh, else None."""
+    cached = market_cache.get(ticker)
+    if cached and time.time() - cached[0] < MARKET_CACHE_TTL:
+        return cached[1]
+    return None
+
+def cache_market(ticker, market):
+    if len(market_cache) >= MARKET_CACHE_SIZE:
+        market_cache.clear() # Cheap bound: tickers rarely exceed this in one session
+    market_cache[ticker] = (time.time(), market)
+
+def fetch_market_details(ticker):
+    """
+    Fetches the public market record (price, title, expiration) for one ticker.
+    Records are cached for MARKET_CACHE_TTL seconds, so repeat lookups are free.
+    """
+    market = get_cached_market(ticker)
+    if market is not None:
+        return market
+
+    m_res = session.get(MARKETS_URL + "/" + ticker, timeout=REQUEST_TIMEOUT)
+    m_res.raise_for_status() # Error bodies (404/429) must never be cached as a market
+    market = json_loads(m_res.content)['market']
+
+    cache_market(ticker, market)
+    return market
+
+def fetch_markets_batch(tickers):
+    """
+    Fetches many market records in ONE call via /markets?tickers=a,b,c.
+    Returns {ticker: market dict} for every ticker that was cached or returned by Kalshi.
+    """
+    found = {}
+    missing = []
+    for ticker in tickers:
+        market = get_cached_market(ticker)
+        if market is not None: found[ticker] = market
+        else: missing.append(ticker)
+
+    if missing:
+        m_res = session.get(MARKETS_URL, params={"tickers": ",".join(missing), "limit": len(missing)}, timeout=REQUEST_TIMEOUT)
+        m_res.raise_for_status() # The caller falls back to per-ticker lookups
+        for market in json_loads(m_res.content).get('markets', []):
+            ticker = market.get('ticker')
+            cache_market(ticker, market)
+            found[ticker] = market
+
+    return found
+
 def get_portfolio_summary():
     """Fetches balance and active positions, returning them for analysis."""
     print("💼 Accessing Portfolio...")
@@ -111,25 +200,39 @@ def get_portfolio_summary():
         print("📭 No active positions found.")
         return []
 
-    print(f"\n📊 Current Holdings ({len(positions)} markets):")
-    print("-" * 85)
-    print(f"{'Market Ticker':<30} | {'Side':<4} | {'Count':<6} | {'Current Price':<15}")
-    print("-" * 85)
+    # The holdings table is buffered and written in one go once every row is known
+    table = [
+        f"\n📊 Current Holdings ({len(positions)} markets):",
+        "-" * 85,
+        f"{'Market Ticker':<30} | {'Side':<4} | {'Count':<6} | {'Current Price':<15}",
+        "-" * 85
+    ]
+
+    open_positions = [p for p in positions if p.get('position', 0) != 0] # Skip closed positions
+
+    # 3. Fetch Market Details (Price & Question) for every ticker in a single batched call
+    tickers = [p.get('ticker') for p in open_positions]
+    try:
+        markets_by_ticker = fetch_markets_batch(tickers)
+    except Exception:
+        markets_by_ticker = {}
+
+    # Anything the batch didn't return falls back to per-ticker lookups, overlapped in parallel
+    stragglers = [t for t in tickers if t not in markets_by_ticker]
+    futures = {}
+    if stragglers:
+        with ThreadPoolExecutor(max_workers=MARKET_FETCH_WORKERS) as pool:
+            futures = {t: pool.submit(fetch_market_details, t) for t in stragglers}
 
-    for p in positions:
+    for p in open_positions:
         ticker = p.get('ticker')
         raw_count = p.get('position', 0)
-        
-        if raw_count == 0: continue # Skip closed positions
 
         side = "YES" if raw_count > 0 else "NO"
         count = abs(raw_count)
 
-        # 3. Fetch Market Details (Price & Question)
-        market_url = f"https://api.elections.kalshi.com/trade-api/v2/markets/{ticker}"
         try:
-            m_res = requests.get(market_url)
-            m_data = m_res.json().get('market', {})
+            m_data = markets_by_ticker[ticker] if ticker in markets_by_ticker else futures[ticker].result()
             
             # Price logic
             current_price = m_data.get('yes_bid', 0)
@@ -145,12 +248,13 @@ def get_portfolio_summary():
                 "expiration": m_data.get('expiration_time', 'Unknown')
             })
 
-            print(f"{ticker:<30} | {side:<4} | {count:<6} | {price_display:<15}")
+            table.append(f"{ticker:<30} | {side:<4} | {count:<6} | {price_display:<15}")
 
         except Exception:
-            print(f"{ticker:<30} | {side:<4} | {count:<6} | (Data unavailable)")
+            table.append(f"{ticker:<30} | {side:<4} | {count:<6} | (Data unavailable)")
 
-    print("-" * 85)
+    table.append("-" * 85)
+    print("\n".join(table))
     return active_holdings
 
 def analyze_holdings_news(holdings):
@@ -167,28 +271,48 @@ def analyze_holdings_news(holdings):
     top_holdings = sorted(holdings, key=lambda x: x['count'], reverse=True)[:3]
 
     for item in top_holdings:
-        question = item['question']
-        print(f"\n🔍 Scanning news for: '{question}'...")
-        
-        # We reuse your existing research function
-        analysis = researcher.get_ai_analysis(
-            question, 
-            item['current_price'], 
-            item['expiration']
-        )
+        print(f"🔍 Scanning news for: '{item['question']}'...")
+
+    # The news lookups are independent AI calls, so run them side by side and
+    # report each one as soon as it lands instead of waiting on them in sequence.
+    with ThreadPoolExecutor(max_workers=len(top_holdings)) as pool:
+        futures = {
+            # We reuse your existing research function: one single-market group per holding
+            pool.submit(researcher.research_event_group, "Portfolio", [{
+                "ticker": item['ticker'],
+                "event_title": item['question'],
+                "option_name": "Yes",
+                "yes_ask": item['current_price']
+            }], strategy="holding_check"): item
+            for item in top_holdings
+        }
+
+        for future in as_completed(futures):
+            item = futures[future]
+            try:
+                picks = future.result()
+            except Exception:
+                picks = []
+
+            # The pick for this holding's ticker, if the AI returned one
+            analysis = next((p for p in picks if p['ticker'] == item['ticker']), None)
+
+            report = [f"\n📰 {item['question']}"]
+            if analysis:
+                # Check for danger: the AI's real-world odds against the side you hold
+                real_prob = analysis['estimated_real_prob']
+                sentiment_check = "✅ Holding seems safe."
+                if item['side'] == "YES" and real_prob < item['current_price']:
+                    sentiment_check = "⚠️ WARNING: News trend is NEGATIVE for your position."
+                elif item['side'] == "NO" and real_prob > item['current_price']:
+                    sentiment_check = "⚠️ WARNING: News trend is POSITIVE against your short."
+
+                report.append(f"   > Update: {analysis['reasoning']}")
+                report.append(f"   > Verdict: {sentiment_check}")
+            else:
+                report.append("   > (AI could not retrieve news for this item)")
 
-        if analysis:
-            # Check for danger (If you hold YES but AI says BUY_NO)
-            sentiment_check = "✅ Holding seems safe."
-            if item['side'] == "YES" and analysis['verdict'] == "BUY_NO":
-                sentiment_check = "⚠️ WARNING: News trend is NEGATIVE for your position."
-            elif item['side'] == "NO" and analysis['verdict'] == "BUY_YES":
-                sentiment_check = "⚠️ WARNING: News trend is POSITIVE against your short."
-
-            print(f"   > Update: {analysis.get('reasoning', 'No news found.')}")
-            print(f"   > Verdict: {sentiment_check}")
-        else:
-            print("   > (AI could not retrieve news for this item)")
+            print("\n".join(report))
 
     print("\n✅ Portfolio Review Complete.")
 
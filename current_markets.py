@@ -1,81 +1,198 @@
-import time
+import heapq
+from urllib.parse import urlencode
 from datetime import datetime, timedelta, timezone
 from collections import defaultdict
+from functools import lru_cache
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import disk_cache
+
+# orjson decodes the large nested-market pages several times faster than stdlib json
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    import json
+    json_loads = json.loads
+
+# Shared HTTP session: one keep-alive pool for every page of every scout.
+# No fixed sleep between pages: we only back off when Kalshi pushes back
+# (429/5xx), waiting exactly as long as its Retry-After header asks.
+session = requests.Session()
+session.headers.update({ "User-Agent": "KalshiScout/2.0", "Accept": "application/json" })
+session.mount("https://", HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=64,
+    max_retries=Retry(
+        total=5,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=frozenset(["GET"]),
+        respect_retry_after_header=True
+    )
+))
+
+EVENTS_URL = "https://api.elections.kalshi.com/trade-api/v2/events"
+EVENTS_PARAMS = { "limit": 200, "status": "open", "with_nested_markets": "true" }
+REQUEST_TIMEOUT = (3, 10) # (connect, read) seconds, so a stalled page can't hang a scout
+ISO_SECONDS = "%Y-%m-%dT%H:%M:%S" # Second-resolution bounds for the string pre-filters
+
+# --- PAGE CACHE ---
+# Raw /events pages are kept on disk for a short while, so re-running the bot
+# (e.g. repeated dashboard clicks) replays the scan without touching the network.
+PAGE_CACHE_TTL = 60 # Seconds a cached page is considered fresh
+
+@lru_cache(maxsize=4096)
+def parse_iso_time(time_str):
+    """
+    Parses a Kalshi ISO-8601 timestamp into an aware datetime.
+    Cached: markets inside one event usually share the same close/expiration string.
+    """
+    # Fast path: Kalshi's fixed 'YYYY-MM-DDTHH:MM:SSZ' shape, sliced straight into a datetime
+    if len(time_str) == 20 and time_str[-1] == 'Z' and time_str[10] == 'T':
+        try:
+            return datetime(
+                int(time_str[0:4]), int(time_str[5:7]), int(time_str[8:10]),
+                int(time_str[11:13]), int(time_str[14:16]), int(time_str[17:19]),
+                tzinfo=timezone.utc
+            )
+        except ValueError:
+            pass # Odd shape that happens to be 20 chars: let the general parser decide
 
-def get_sport_markets(max_markets=30):
+    return datetime.fromisoformat(time_str[:-1] + "+00:00" if time_str.endswith("Z") else time_str)
+
+def fetch_events_page(cursor=None):
     """
-    Specialized fetcher ONLY for Sports.
-    Handles league mapping (NBA, NFL) and enforces game diversity (max 4 per game).
+    Fetches one page of open events. Returns (events, next_cursor).
+    Pages are served from the disk cache when fetched within the last PAGE_CACHE_TTL seconds.
+    """
+    params = dict(EVENTS_PARAMS)
+    if cursor: params["cursor"] = cursor
+
+    cache_path = disk_cache.cache_path("pages", f"{EVENTS_URL}?{urlencode(sorted(params.items()))}")
+    content = disk_cache.read_cache(cache_path, PAGE_CACHE_TTL)
+
+    if content is not None:
+        try:
+            data = json_loads(content)
+            return data.get("events", []), data.get("cursor")
+        except ValueError:
+            pass # Truncated/corrupt file: treat it as a miss and refetch
+
+    response = session.get(EVENTS_URL, params=params, timeout=REQUEST_TIMEOUT)
+    if response.status_code != 200:
+        # Throttling/5xx were already retried by the session; anything left ends the scan, loudly
+        print(f"⚠️ SCOUT: Kalshi returned {response.status_code}, stopping pagination early.")
+        return [], None
+
+    content = response.content
+    data = json_loads(content)
+    disk_cache.write_cache(cache_path, content) # Only pages that decoded are cached
+    return data.get("events", []), data.get("cursor")
+
+def iter_event_pages():
+    """
+    Walks the paginated /events feed, yielding one list of events per page.
+    The next page is requested in the background as soon as its cursor is known,
+    so the download overlaps with the caller filtering the current page.
+    Stopping iteration early (break) cancels any page still in flight.
+    """
+    pool = ThreadPoolExecutor(max_workers=1)
+    try:
+        future = pool.submit(fetch_events_page)
+        while future:
+            events, cursor = future.result()
+            if not events: return
+
+            future = pool.submit(fetch_events_page, cursor) if cursor else None
+            yield events
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+def scan_events(sinks, stop=None):
+    """
+    Walks the /events feed ONCE and hands each event to every scout that wants it.
+    sinks: list of (predicate(event_cat) -> bool, consume(event, event_cat) -> None) pairs,
+           where event_cat is the event's lowercased category (computed once, shared by every sink).
+    stop: optional callable checked after each page; paging ends as soon as it returns True.
+    """
+    for events in iter_event_pages():
+        for event in events:
+            event_cat = event.get("category", "Uncategorized").lower()
+            for predicate, consume in sinks:
+                if predicate(event_cat): consume(event, event_cat)
+
+        if stop and stop(): return
+
+def iter_window_markets(event, category, now, cutoff_time, now_iso, cutoff_iso):
     """
-    base_url = "https://api.elections.kalshi.com/trade-api/v2/events"
-    params = { "limit": 100, "status": "open", "with_nested_markets": "true" }
-    headers = { "User-Agent": "KalshiScout/2.0", "Accept": "application/json" }
+    Yields a clean market dict for every 10-90c market in the event that closes in (now, cutoff_time].
+    Shared by the sports and standard-category scouts; category is stamped on every market.
+    """
+    # Event-level fields are read once, not once per market
+    e_title, e_id = event.get("title"), event.get("event_ticker")
+
+    for market in event.get("markets", []):
+        mget = market.get
+
+        # Cheapest gate first: skip price traps before any time parsing
+        yes_price = mget("yes_ask", 0)
+        if yes_price < 10 or yes_price > 90:
+            continue
+
+        time_check_str = mget("close_time") or mget("expiration_time")
+        if not time_check_str: continue
+
+        # Fast reject outside the window without parsing (see get_daily_markets)
+        if time_check_str[-1] == 'Z' and not (now_iso <= time_check_str[:19] <= cutoff_iso):
+            continue
 
+        try:
+            check_dt = parse_iso_time(time_check_str)
+        except ValueError: continue
+
+        if check_dt <= now or check_dt > cutoff_time:
+            continue
+
+        yield {
+            "ticker": mget("ticker"),
+            "event_title": e_title,
+            "option_name": mget("title") or mget("subtitle"),
+            "category": category,
+            "yes_ask": yes_price,
+            "volume": mget("volume", 0),
+            "liquidity": mget("liquidity", 0),
+            "event_id": e_id
+        }
+
+# --- SPORTS ---
+SPORTS_LEAGUES = frozenset(["sports", "nba", "nfl", "mlb"])
+
+def sports_sink(sports_markets):
+    """
+    Builds the (predicate, consume) pair that collects sports markets into sports_markets.
+    Handles league mapping (NBA, NFL -> 'Sports') and the 21-day window.
+    """
     now = datetime.now(timezone.utc)
     cutoff_time = now + timedelta(days=21) # Sports Postponement Buffer
-    
-    sports_leagues = ["sports", "nba", "nfl", "mlb"]
-    sports_markets = []
-    
-    cursor = None
-    has_more_pages = True
+    now_iso, cutoff_iso = now.strftime(ISO_SECONDS), cutoff_time.strftime(ISO_SECONDS)
 
-    while has_more_pages:
-        if cursor: params["cursor"] = cursor
+    def wants(event_cat):
+        return event_cat in SPORTS_LEAGUES
 
-        try:
-            response = requests.get(base_url, params=params, headers=headers)
-            if response.status_code != 200: break
-
-            data = response.json()
-            events = data.get("events", [])
-            cursor = data.get("cursor")
-
-            if not events: break
-
-            for event in events:
-                event_cat = event.get("category", "Uncategorized").lower()
-                if event_cat not in sports_leagues: 
-                    continue
-                
-                raw_markets = event.get("markets", [])
-
-                for market in raw_markets:
-                    time_check_str = market.get("close_time") or market.get("expiration_time")
-                    if not time_check_str: continue
-
-                    try:
-                        check_dt = datetime.fromisoformat(time_check_str.replace('Z', '+00:00'))
-                    except ValueError: continue
-                    
-                    if check_dt <= now or check_dt > cutoff_time:
-                        continue
-
-                    yes_price = market.get("yes_ask", 0)
-                    if yes_price < 10 or yes_price > 90:
-                        continue
-
-                    clean_market = {
-                        "ticker": market.get("ticker"),
-                        "event_title": event.get("title"),
-                        "option_name": market.get("title") or market.get("subtitle"),
-                        "category": "Sports", # Force everything into one clean category
-                        "yes_ask": yes_price,
-                        "volume": market.get("volume", 0),
-                        "liquidity": market.get("liquidity", 0),
-                        "event_id": event.get("event_ticker")
-                    }
-                    sports_markets.append(clean_market)
-
-            if not cursor: has_more_pages = False
-            else: time.sleep(0.1)
+    def consume(event, event_cat):
+        # Force everything into one clean category
+        sports_markets.extend(iter_window_markets(event, "Sports", now, cutoff_time, now_iso, cutoff_iso))
 
-        except Exception as e:
-            has_more_pages = False
+    return wants, consume
 
-    # --- SPORTS DIVERSITY FILTER ---
-    sports_markets.sort(key=lambda x: x['volume'], reverse=True)
+def select_diverse_sports(sports_markets, max_markets):
+    """Top-volume sports markets, enforcing game diversity (max 4 per game)."""
+    sports_markets.sort(key=itemgetter('volume'), reverse=True)
     
     diverse_list = []
     seen_games = defaultdict(int)
@@ -91,191 +208,186 @@ def get_sport_markets(max_markets=30):
             
         if len(diverse_list) >= max_markets:
             break
+
+    return diverse_list
+
+def get_sport_markets(max_markets=30):
+    """
+    Specialized fetcher ONLY for Sports.
+    Handles league mapping (NBA, NFL) and enforces game diversity (max 4 per game).
+    """
+    sports_markets = []
+    
+    try:
+        scan_events([sports_sink(sports_markets)])
+    except Exception:
+        pass # Best-effort: keep whatever was gathered before the failure
+
+    diverse_list = select_diverse_sports(sports_markets, max_markets)
             
     # Return as a dict so it matches the format of fetch_current_kalshi_markets
     return {"Sports": diverse_list} if diverse_list else {}
 
+# --- STANDARD CATEGORIES ---
 def fetch_current_kalshi_markets(target_categories, max_per_category=30):
     """
     Acts as the Main Manager for fetching markets.
-    If 'Sports' is requested, it delegates that to get_sport_markets().
-    Fetches the rest using the standard 30-day volume sort.
+    Fetches standard categories using the 30-day volume sort; if 'Sports' is
+    requested too, its sink rides along on the SAME scan instead of paging again.
     """
     # 1. Check if Sports was requested and separate it
-    target_cats_lower = [c.lower() for c in target_categories]
+    target_cats_lower = frozenset(c.lower() for c in target_categories)
     
-    wants_sports = False
-    if "sports" in target_cats_lower:
-        wants_sports = True
-        target_cats_lower.remove("sports") # Remove it so the standard loop ignores it
+    wants_sports = "sports" in target_cats_lower
+    target_cats_lower -= {"sports"} # Remove it so the standard sink ignores it
+
+    # Lowercase -> caller's spelling, so buckets are keyed exactly as requested
+    # (e.g. 'Politics') no matter how Kalshi cases the event category.
+    canonical_cats = {c.lower(): c for c in target_categories if c.lower() in target_cats_lower}
         
     categorized_markets = defaultdict(list)
-    
-    # 2. Fetch standard categories (Politics, Econ, etc.) if any are left
-    if target_cats_lower:
-        base_url = "https://api.elections.kalshi.com/trade-api/v2/events"
-        params = { "limit": 100, "status": "open", "with_nested_markets": "true" }
-        headers = { "User-Agent": "KalshiScout/2.0", "Accept": "application/json" }
+    remaining = set(canonical_cats.values()) # Categories whose bucket isn't full yet
 
+    # Sports reads the whole feed anyway, so full buckets only matter when the scan can stop early;
+    # on a full read every market is collected and the final top-volume pick decides.
+    early_stop = not wants_sports
+    sports_markets = []
+    sinks = []
+
+    # 2. Standard categories (Politics, Econ, etc.) if any are left
+    if target_cats_lower:
         now = datetime.now(timezone.utc)
         cutoff_time = now + timedelta(days=30)
+        now_iso, cutoff_iso = now.strftime(ISO_SECONDS), cutoff_time.strftime(ISO_SECONDS)
         
-        print(f"🔍 SCOUT: Searching standard markets: {', '.join([c.title() for c in target_cats_lower])}...")
-
-        cursor = None
-        has_more_pages = True
-
-        while has_more_pages:
-            if cursor: params["cursor"] = cursor
-
-            try:
-                response = requests.get(base_url, params=params, headers=headers)
-                if response.status_code != 200: break
-
-                data = response.json()
-                events = data.get("events", [])
-                cursor = data.get("cursor")
-
-                if not events: break
-
-                for event in events:
-                    event_cat = event.get("category", "Uncategorized")
-                    
-                    if event_cat.lower() not in target_cats_lower: 
-                        continue
-                    
-                    raw_markets = event.get("markets", [])
-
-                    for market in raw_markets:
-                        time_check_str = market.get("close_time") or market.get("expiration_time")
-                        if not time_check_str: continue
-
-                        try:
-                            check_dt = datetime.fromisoformat(time_check_str.replace('Z', '+00:00'))
-                        except ValueError: continue
-                        
-                        if check_dt <= now or check_dt > cutoff_time:
-                            continue
-
-                        yes_price = market.get("yes_ask", 0)
-                        if yes_price < 10 or yes_price > 90:
-                            continue
-
-                        clean_market = {
-                            "ticker": market.get("ticker"),
-                            "event_title": event.get("title"),
-                            "option_name": market.get("title") or market.get("subtitle"),
-                            "category": event_cat,
-                            "yes_ask": yes_price,
-                            "volume": market.get("volume", 0),
-                            "liquidity": market.get("liquidity", 0),
-                            "event_id": event.get("event_ticker")
-                        }
-                        categorized_markets[event_cat].append(clean_market)
-
-                if not cursor: has_more_pages = False
-                else: time.sleep(0.1)
-
-            except Exception as e:
-                print(f"⚠️ Exception: {e}")
-                has_more_pages = False
-
-        # Sort non-sports categories purely by volume
-        for cat in categorized_markets:
-            categorized_markets[cat].sort(key=lambda x: x['volume'], reverse=True)
-            categorized_markets[cat] = categorized_markets[cat][:max_per_category]
-
-    # 3. Fetch Sports (if requested) using the specialized function
+        print(f"🔍 SCOUT: Searching standard markets: {', '.join([c.title() for c in canonical_cats])}...")
+
+        def wants(event_cat):
+            # Unwanted, or (when stopping early) its bucket is already full
+            if early_stop:
+                return canonical_cats.get(event_cat) in remaining
+            return event_cat in canonical_cats
+
+        def consume(event, event_cat):
+            event_cat = canonical_cats[event_cat]
+            markets = list(iter_window_markets(event, event_cat, now, cutoff_time, now_iso, cutoff_iso))
+            if not markets:
+                return # Only categories with at least one market get a bucket
+
+            bucket = categorized_markets[event_cat]
+            bucket.extend(markets)
+            if len(bucket) >= max_per_category:
+                remaining.discard(event_cat)
+
+        sinks.append((wants, consume))
+
+    # 3. Sports (if requested) shares the scan through its own sink
     if wants_sports:
-        sports_data = get_sport_markets(max_markets=max_per_category)
-        
-        # Merge the sports data into the main dictionary
-        if "Sports" in sports_data:
-            categorized_markets["Sports"] = sports_data["Sports"]
+        sinks.append(sports_sink(sports_markets))
 
-    return categorized_markets
+    if sinks:
+        # Sports reads the whole feed; otherwise stop once every bucket is full
+        stop = (lambda: not remaining) if early_stop else None
+        try:
+            scan_events(sinks, stop=stop)
+        except Exception as e:
+            print(f"⚠️ Exception: {e}")
+
+    # Keep the top-volume markets per category (partial selection, no full sort)
+    for cat, markets in categorized_markets.items():
+        categorized_markets[cat] = heapq.nlargest(max_per_category, markets, key=itemgetter('volume'))
+
+    # Merge the sports data into the main dictionary
+    if wants_sports:
+        diverse_list = select_diverse_sports(sports_markets, max_per_category)
+        if diverse_list:
+            categorized_markets["Sports"] = diverse_list
 
-# ... [Ensure get_sport_markets is defined directly beneath this in the same file] ...
+    return categorized_markets
 
+# --- DAILY ---
 def get_daily_markets(target_categories):
     """
     Fetches active Kalshi markets closing/expiring within 24 hours.
     Returns a flat list sorted by closing time.
     """
-    base_url = "https://api.elections.kalshi.com/trade-api/v2/events"
-    params = { "limit": 100, "status": "open", "with_nested_markets": "true" }
-    headers = { "User-Agent": "KalshiScout/2.0", "Accept": "application/json" }
-
     now = datetime.now(timezone.utc)
     cutoff_time = now + timedelta(hours=24)
-    target_cats_lower = [c.lower() for c in target_categories]
+    target_cats_lower = tuple({c.lower() for c in target_categories}) # Deduplicated
+
+    # Second-resolution ISO bounds for the cheap string pre-filter below
+    now_iso, cutoff_iso = now.strftime(ISO_SECONDS), cutoff_time.strftime(ISO_SECONDS)
     
     print(f"⏰ SCOUT: Searching markets (Trading Closes < 24h)...")
 
     daily_candidates = []
-    cursor = None
-    has_more_pages = True
-
-    while has_more_pages:
-        if cursor: params["cursor"] = cursor
-        try:
-            response = requests.get(base_url, params=params, headers=headers)
-            if response.status_code != 200: break
-
-            data = response.json()
-            events = data.get("events", [])
-            cursor = data.get("cursor")
-
-            if not events: break
-
-            for event in events:
-                event_cat = event.get("category", "Uncategorized").lower()
-                if not any(t in event_cat for t in target_cats_lower): continue
-
-                for market in event.get("markets", []):
-                    # Time Logic
-                    close_str = market.get("close_time")
-                    exp_str = market.get("expiration_time")
-                    
-                    relevant_dt = None
-                    if close_str:
-                        try: relevant_dt = datetime.fromisoformat(close_str.replace('Z', '+00:00'))
-                        except ValueError: pass
-                    if not relevant_dt and exp_str:
-                        try: relevant_dt = datetime.fromisoformat(exp_str.replace('Z', '+00:00'))
-                        except ValueError: pass
-
-                    if not relevant_dt: continue
-
-                    # Must close within next 24h
-                    if not (now < relevant_dt <= cutoff_time): continue
-
-                    yes_price = market.get("yes_ask", 0)
-                    if yes_price < 10 or yes_price > 90: continue
-
-                    clean_market = {
-                        "ticker": market.get("ticker"),
-                        "event_title": event.get("title"),
-                        "option_name": market.get("title") or market.get("subtitle"),
-                        "category": event.get("category"),
-                        "relevant_dt": relevant_dt,
-                        "yes_ask": yes_price,
-                        "volume": market.get("volume", 0)
-                    }
-                    daily_candidates.append(clean_market)
-
-            if not cursor: has_more_pages = False
-            else: time.sleep(0.1)
 
-        except Exception as e:
-            print(f"⚠️ Exception: {e}")
-            has_more_pages = False
+    # Kalshi only has a few dozen distinct categories, so each one is substring-matched
+    # against the targets once and the verdict reused for every later event
+    category_matches = {}
+
+    def wants(event_cat):
+        match = category_matches.get(event_cat)
+        if match is None:
+            match = category_matches[event_cat] = any(t in event_cat for t in target_cats_lower)
+        return match
+
+    def consume(event, event_cat):
+        # Event-level fields are read once, not once per market
+        e_title, e_cat = event.get("title"), event.get("category")
+
+        for market in event.get("markets", []):
+            mget = market.get
+
+            # Cheapest gate first: skip price traps before any time parsing
+            yes_price = mget("yes_ask", 0)
+            if yes_price < 10 or yes_price > 90: continue
+
+            # Time Logic
+            close_str = mget("close_time")
+            exp_str = mget("expiration_time")
+
+            # Fast reject: Kalshi UTC ('...Z') timestamps sort lexicographically,
+            # so anything clearly outside the window is skipped without parsing.
+            time_str = close_str or exp_str
+            if time_str and time_str[-1] == 'Z' and not (now_iso <= time_str[:19] <= cutoff_iso):
+                continue
+
+            relevant_dt = None
+            if close_str:
+                try: relevant_dt = parse_iso_time(close_str)
+                except ValueError: pass
+            if not relevant_dt and exp_str:
+                try: relevant_dt = parse_iso_time(exp_str)
+                except ValueError: pass
+
+            if not relevant_dt: continue
+
+            # Must close within next 24h
+            if not (now < relevant_dt <= cutoff_time): continue
+
+            clean_market = {
+                "ticker": mget("ticker"),
+                "event_title": e_title,
+                "option_name": mget("title") or mget("subtitle"),
+                "category": e_cat,
+                "relevant_dt": relevant_dt,
+                "yes_ask": yes_price,
+                "volume": mget("volume", 0)
+            }
+            daily_candidates.append(clean_market)
+
+    try:
+        scan_events([(wants, consume)])
+    except Exception as e:
+        print(f"⚠️ Exception: {e}")
 
     # Sort by time (Soonest -> Latest)
-    daily_candidates.sort(key=lambda x: x['relevant_dt'])
+    daily_candidates.sort(key=itemgetter('relevant_dt'))
     
     print(f"✅ Found {len(daily_candidates)} valid markets.")
     return daily_candidates
+
 if __name__ == "__main__":
     # Example Usage
     my_cats = ['Sports']
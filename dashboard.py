@@ -1,8 +1,11 @@
 import streamlit as st
-import pandas as pd
 import time
+from concurrent.futures import ThreadPoolExecutor
 import main  # Import your existing bot logic
+import dashboard_views as views # Bets table + results rendering shared by both dashboards
 '''streamlit run dashboard.py'''
+PREFETCH_MAX_AGE = main.SCOUT_CACHE_TTL # Same window the Scout's own snapshot reuse trusts
+
 # --- PAGE CONFIGURATION ---
 st.set_page_config(
     page_title="AdvAIsor",
@@ -10,6 +13,46 @@ st.set_page_config(
     layout="wide"
 )
 
+# Session state is the single source of truth for the last run
+st.session_state.setdefault('results', None)
+st.session_state.setdefault('last_run', None)
+
+# --- CACHED RUNS ---
+@st.cache_data(ttl=60, show_spinner=False)
+def run_cached_advisor(mode, budget_cents, _prefetched_markets=None):
+    """
+    Runs the bot once per (mode, budget) per minute.
+    Repeat clicks inside the TTL return the stored results instead of re-scanning Kalshi.
+    (The leading underscore keeps the prefetched markets out of Streamlit's cache key.)
+    """
+    return main.run_advisor_bot(mode=mode, prefetched_markets=_prefetched_markets, budget=budget_cents)
+
+# --- BACKGROUND SCOUT ---
+@st.cache_resource
+def get_prefetch_pool():
+    """One background worker per server process for speculative scout runs."""
+    return ThreadPoolExecutor(max_workers=1)
+
+def take_prefetched_markets():
+    """Returns the background Standard scout result if it is fresh and succeeded, else None. Single use."""
+    future = st.session_state.pop('scout_future', None)
+    if future is None:
+        return None
+    try:
+        fetched_at, markets = future.result()
+    except Exception:
+        return None # The normal in-line scout will run instead
+
+    # Age of the data itself, not of the page: a reused disk snapshot may predate the page load
+    if time.time() - fetched_at > PREFETCH_MAX_AGE:
+        return None
+    return markets
+
+# Start scouting the Standard categories while the user is still reading the page,
+# so the button click only has to wait for the AI step
+if 'scout_future' not in st.session_state:
+    st.session_state['scout_future'] = get_prefetch_pool().submit(main.scout_snapshot, "standard")
+
 # --- HEADER ---
 st.title("🤖  Market Advisor")
 st.markdown("### *Artificial Intelligence Prediction Market Analyst*")
@@ -18,13 +61,14 @@ st.markdown("### *Artificial Intelligence Prediction Market Analyst*")
 with st.sidebar:
     st.header("⚙️ Configuration")
     budget = st.number_input("Daily Budget ($)", value=100)
+    budget_cents = int(budget * 100) # The bot works in cents
     
     st.divider()
     
     st.subheader("🚀 Select Strategy")
     
-    # Create two columns for side-by-side buttons
-    col1, col2 = st.columns(2)
+    # Create three columns for side-by-side buttons
+    col1, col2, col3 = st.columns(3)
 
     # BUTTON 1: STANDARD (Specific Categories)
     if col1.button("Standard", type="primary", use_container_width=True):
@@ -32,8 +76,8 @@ with st.sidebar:
         with st.spinner("🤖 Scouting specific categories..."):
             try:
                 # Mode="standard" triggers the category-based fetch
-                results = main.run_advisor_bot(mode="standard")
-                st.session_state['results'] = results
+                results = run_cached_advisor("standard", budget_cents, take_prefetched_markets())
+                st.session_state['results'] = {"Standard": results}
                 st.session_state['last_run'] = time.strftime("%Y-%m-%d %H:%M:%S")
                 st.success("Standard Scan Complete!")
             except Exception as e:
@@ -45,72 +89,33 @@ with st.sidebar:
         with st.spinner("⚡ Scouting daily movers..."):
             try:
                 # Mode="daily" triggers the expiration-based fetch
-                results = main.run_advisor_bot(mode="daily")
-                st.session_state['results'] = results
+                results = run_cached_advisor("daily", budget_cents)
+                st.session_state['results'] = {"Daily": results}
                 st.session_state['last_run'] = time.strftime("%Y-%m-%d %H:%M:%S")
                 st.success("Daily Scan Complete!")
             except Exception as e:
                 st.error(f"Error: {e}")
-# --- MAIN DISPLAY area ---
-if 'results' in st.session_state:
-    data = st.session_state['results']
-    
-    # 1. Summary Metrics
-    col1, col2, col3 = st.columns(3)
-    final_orders = data.get('final_orders', [])
-    
-    total_spend = sum(item['suggested_bet'] for item in final_orders)
-    
-    col1.metric("💰 Total Capital Allocated", f"${total_spend/100:.2f}")
-    col2.metric("📊 Opportunities Found", len(final_orders))
-    col3.metric("🕒 Last Update", st.session_state['last_run'])
 
-    st.divider()
-
-    # 2. Detailed Strategy Table
-    st.subheader("🎯 Recommended Bets")
-    
-    if final_orders:
-        # Convert list of dicts to a clean DataFrame for display
-        df = pd.DataFrame(final_orders)
-        
-        # Clean up columns for the user
-        # We assume your keys are: 'ticker', 'title', 'side', 'suggested_bet', 'confidence', 'reason'
-        display_df = df.copy()
-        
-        # Format the Bet Size to $
-        if 'suggested_bet' in display_df.columns:
-            display_df['Bet Size'] = display_df['suggested_bet'].apply(lambda x: f"${x/100:.2f}")
-        
-        # Rename columns for clarity
-        display_df = display_df.rename(columns={
-            'ticker': 'Ticker',
-            'title': 'Event',
-            'side': 'Side',
-            'confidence': 'Conf (1-10)',
-            'reason': 'AI Reasoning'
-        })
-        
-        # Select and Reorder columns to show only what matters
-        cols_to_show = ['Event', 'Side', 'Bet Size', 'Conf (1-10)', 'AI Reasoning']
-        # Filter to only existing columns (prevents crash if a key is missing)
-        final_cols = [c for c in cols_to_show if c in display_df.columns]
-        
-        # Display professional interactive table
-        st.dataframe(
-            display_df[final_cols], 
-            use_container_width=True, 
-            hide_index=True,
-            column_config={
-                "AI Reasoning": st.column_config.TextColumn("AI Reasoning", width="large"),
-            }
-        )
-    else:
-        st.warning("No bets met the criteria today.")
+    # BUTTON 3: BOTH (Standard + Daily at the same time)
+    if col3.button("Both", type="secondary", use_container_width=True):
+        st.info("Targeting: Politics, Econ, Sports + all markets expiring < 24h")
+        with st.spinner("🤖⚡ Running both strategies at once..."):
+            try:
+                # Independent pipelines: wall time ~ the slower run, not the sum.
+                # Runs go through the cached wrapper, so a later single-mode click is free.
+                with ThreadPoolExecutor(max_workers=2) as pool:
+                    daily = pool.submit(run_cached_advisor, "daily", budget_cents)
+                    standard = pool.submit(run_cached_advisor, "standard", budget_cents, take_prefetched_markets())
+                    st.session_state['results'] = {"Standard": standard.result(), "Daily": daily.result()}
+                st.session_state['last_run'] = time.strftime("%Y-%m-%d %H:%M:%S")
+                st.success("Both Scans Complete!")
+            except Exception as e:
+                st.error(f"Error: {e}")
 
-    # 3. Raw Logs (Hidden inside an expander)
-    with st.expander("🔍 View Raw Scout Data & Debug Logs"):
-        st.json(data)
+# --- MAIN DISPLAY area ---
+if st.session_state['results'] is not None:
+    # session_state['results'] maps a strategy label -> that run's results
+    views.render_runs(st.session_state['results'])
 
 else:
     # Default State
@@ -0,0 +1,115 @@
+import math
+import streamlit as st
+import pandas as pd
+
+# --- SHARED RESULTS VIEWS ---
+# The bets table and results rendering used by both dashboards (dashboard.py, dashboardv2.py).
+# Only the sidebar / run controls differ between them, so everything below lives here once.
+PAGE_SIZE = 25 # Table rows sent to the browser per page
+DEBUG_LIST_LIMIT = 20 # Items per list shown in the raw debug JSON
+
+# Columns of an advisor order, passed explicitly so pandas skips schema inference
+ORDER_COLUMNS = ('ticker', 'title', 'side', 'suggested_bet', 'confidence', 'reason')
+
+# Order keys -> user-facing column names, and which of them the table shows (in order)
+COLUMN_RENAMES = {
+    'ticker': 'Ticker',
+    'title': 'Event',
+    'side': 'Side',
+    'confidence': 'Conf (1-10)',
+    'reason': 'AI Reasoning'
+}
+COLS_TO_SHOW = ('Event', 'Side', 'Bet Size', 'Conf (1-10)', 'AI Reasoning')
+
+# --- BETS TABLE ---
+@st.cache_data(show_spinner=False)
+def build_bets_table(final_orders):
+    """
+    Turns the advisor's orders into (total_spend_cents, display table).
+    Cached on the orders themselves, so reruns from unrelated widgets skip the rebuild.
+    """
+    # Convert list of dicts to a DataFrame once; the metrics and the table both read from it
+    df = pd.DataFrame.from_records(final_orders, columns=ORDER_COLUMNS)
+
+    # Compact dtypes = a smaller Arrow payload to the browser: YES/NO as a category,
+    # numbers downcast to the smallest int that fits (left as float if the AI sent fractions)
+    df['side'] = df['side'].astype('category')
+    for col in ('suggested_bet', 'confidence'):
+        df[col] = pd.to_numeric(df[col], errors='coerce', downcast='integer')
+
+    total_spend = df['suggested_bet'].sum() if 'suggested_bet' in df.columns else 0
+
+    # Rename columns for clarity (returns a new frame, so df itself is untouched)
+    display_df = df.rename(columns=COLUMN_RENAMES)
+    
+    # Bet Size stays numeric (cents -> dollars in one vectorized step);
+    # the "$" formatting is left to the table's column config
+    if 'suggested_bet' in display_df.columns:
+        display_df['Bet Size'] = display_df['suggested_bet'] / 100
+    
+    # Select and Reorder columns to show only what matters
+    # Filter to only existing columns (prevents crash if a key is missing)
+    final_cols = [c for c in COLS_TO_SHOW if c in display_df.columns]
+
+    return total_spend, display_df[final_cols]
+
+# --- RESULTS RENDERING ---
+def render_results(data, key):
+    """Draws one run's metrics, bets table and debug logs. key keeps widget ids unique per tab."""
+    # 1. Summary Metrics
+    col1, col2, col3 = st.columns(3)
+    final_orders = data.get('final_orders', [])
+
+    total_spend, table_df = build_bets_table(final_orders)
+    
+    col1.metric("💰 Total Capital Allocated", f"${total_spend/100:.2f}")
+    col2.metric("📊 Opportunities Found", len(final_orders))
+    col3.metric("🕒 Last Update", st.session_state['last_run'])
+
+    st.divider()
+
+    # 2. Detailed Strategy Table
+    st.subheader("🎯 Recommended Bets")
+    
+    if final_orders:
+        # Only one page of rows goes over the websocket per rerun
+        n_pages = max(1, math.ceil(len(table_df) / PAGE_SIZE))
+        page = st.number_input("Page", min_value=1, max_value=n_pages, value=1, key=f"page_{key}") if n_pages > 1 else 1
+        
+        # Display professional interactive table
+        st.dataframe(
+            table_df.iloc[(page - 1) * PAGE_SIZE : page * PAGE_SIZE], 
+            use_container_width=True, 
+            hide_index=True,
+            column_config={
+                "Bet Size": st.column_config.NumberColumn("Bet Size", format="$%.2f", help="Bet size in dollars"),
+                "Conf (1-10)": st.column_config.ProgressColumn("Conf (1-10)", min_value=0, max_value=10, format="%d"),
+                "AI Reasoning": st.column_config.TextColumn("AI Reasoning", width="large"),
+            }
+        )
+
+        # The full set is still one click away, without rendering it
+        st.download_button(
+            "⬇️ Download all bets (CSV)", table_df.to_csv(index=False).encode(),
+            f"bets_{key.lower()}.csv", "text/csv", key=f"download_{key}"
+        )
+    else:
+        st.warning("No bets met the criteria today.")
+
+    # 3. Raw Logs (Hidden inside an expander)
+    # Only serialized on request (and capped), since expander contents are sent even while closed
+    with st.expander("🔍 View Raw Scout Data & Debug Logs"):
+        if st.checkbox("Load raw debug JSON (large)", key=f"debug_{key}"):
+            st.json({k: (v[:DEBUG_LIST_LIMIT] if isinstance(v, list) else v) for k, v in data.items()})
+
+def render_runs(runs):
+    """Draws every run in runs (strategy label -> results): inline for one, one tab each otherwise."""
+    labels = list(runs)
+
+    if len(labels) == 1:
+        render_results(runs[labels[0]], labels[0])
+    else:
+        # "Both" run: one tab per strategy
+        for tab, label in zip(st.tabs(labels), labels):
+            with tab:
+                render_results(runs[label], label)
@@ -1,7 +1,8 @@
 import streamlit as st
-import pandas as pd
 import time
-import mainv2  # Import your existing bot logic
+from concurrent.futures import ThreadPoolExecutor
+import main  # Import your existing bot logic
+import dashboard_views as views # Bets table + results rendering shared by both dashboards
 '''streamlit run dashboardv2.py'''
 # --- PAGE CONFIGURATION ---
 st.set_page_config(
@@ -10,6 +11,19 @@ st.set_page_config(
     layout="wide"
 )
 
+# Session state is the single source of truth for the last run
+st.session_state.setdefault('results', None)
+st.session_state.setdefault('last_run', None)
+
+# --- CACHED RUNS ---
+@st.cache_data(ttl=60, show_spinner=False)
+def run_cached_advisor(mode, budget_cents, categories=None):
+    """
+    Runs the bot once per (mode, budget, categories) per minute.
+    categories is a sorted tuple so the cache key is hashable and order-independent.
+    """
+    return main.run_advisor_bot(mode=mode, categories=list(categories) if categories else None, budget=budget_cents)
+
 # --- HEADER ---
 st.title("🤖  Market Advisor")
 st.markdown("### *Artificial Intelligence Prediction Market Analyst*")
@@ -18,6 +32,7 @@ st.markdown("### *Artificial Intelligence Prediction Market Analyst*")
 with st.sidebar:
     st.header("⚙️ Configuration")
     budget = st.number_input("Daily Budget ($)", value=100)
+    budget_cents = int(budget * 100) # The bot works in cents
     
     st.divider()
     
@@ -38,8 +53,8 @@ with st.sidebar:
     st.divider()
     st.subheader("🚀 Select Strategy")
     
-    # Create two columns for side-by-side buttons
-    col1, col2 = st.columns(2)
+    # Create three columns for side-by-side buttons
+    col1, col2, col3 = st.columns(3)
 
     # BUTTON 1: STANDARD (User-Selected Categories)
     if col1.button("Standard", type="primary", use_container_width=True):
@@ -53,12 +68,9 @@ with st.sidebar:
             with st.spinner(f"🤖 Scouting {len(selected_cats)} categories..."):
                 try:
                     # PASS THE USER SELECTION TO YOUR BOT HERE
-                    results = mainv2.run_advisor_bot(
-                        mode="standard", 
-                        categories=selected_cats
-                    )
+                    results = run_cached_advisor("standard", budget_cents, tuple(sorted(selected_cats)))
                     
-                    st.session_state['results'] = results
+                    st.session_state['results'] = {"Standard": results}
                     st.session_state['last_run'] = time.strftime("%Y-%m-%d %H:%M:%S")
                     st.success("Standard Scan Complete!")
                     
@@ -72,73 +84,41 @@ with st.sidebar:
         with st.spinner("⚡ Scouting daily movers..."):
             try:
                 # Daily mode ignores the specific category list and looks for speed
-                results = mainv2.run_advisor_bot(mode="daily")
+                results = run_cached_advisor("daily", budget_cents)
                 
-                st.session_state['results'] = results
+                st.session_state['results'] = {"Daily": results}
                 st.session_state['last_run'] = time.strftime("%Y-%m-%d %H:%M:%S")
                 st.success("Daily Scan Complete!")
                 
             except Exception as e:
                 st.error(f"Error: {e}")
 
-# --- MAIN DISPLAY AREA ---
-if 'results' in st.session_state:
-    data = st.session_state['results']
-    
-    # 1. Summary Metrics
-    col1, col2, col3 = st.columns(3)
-    final_orders = data.get('final_orders', [])
-    
-    total_spend = sum(item['suggested_bet'] for item in final_orders)
-    
-    col1.metric("💰 Total Capital Allocated", f"${total_spend/100:.2f}")
-    col2.metric("📊 Opportunities Found", len(final_orders))
-    col3.metric("🕒 Last Update", st.session_state['last_run'])
+    # BUTTON 3: BOTH (Standard + Daily at the same time)
+    if col3.button("Both", type="secondary", use_container_width=True):
+        if not selected_cats:
+            st.error("⚠️ Please select at least one category above!")
+        else:
+            st.info(f"Targeting: {', '.join(selected_cats)} + all markets expiring < 24h")
 
-    st.divider()
+            with st.spinner("🤖⚡ Running both strategies at once..."):
+                try:
+                    # Independent pipelines: wall time ~ the slower run, not the sum.
+                    # Runs go through the cached wrapper, so a later single-mode click is free.
+                    with ThreadPoolExecutor(max_workers=2) as pool:
+                        standard = pool.submit(run_cached_advisor, "standard", budget_cents, tuple(sorted(selected_cats)))
+                        daily = pool.submit(run_cached_advisor, "daily", budget_cents)
+                        st.session_state['results'] = {"Standard": standard.result(), "Daily": daily.result()}
 
-    # 2. Detailed Strategy Table
-    st.subheader("🎯 Recommended Bets")
-    
-    if final_orders:
-        # Convert list of dicts to a clean DataFrame for display
-        df = pd.DataFrame(final_orders)
-        
-        # Clean up columns for the user
-        display_df = df.copy()
-        
-        # Format the Bet Size to $
-        if 'suggested_bet' in display_df.columns:
-            display_df['Bet Size'] = display_df['suggested_bet'].apply(lambda x: f"${x/100:.2f}")
-        
-        # Rename columns for clarity
-        display_df = display_df.rename(columns={
-            'ticker': 'Ticker',
-            'title': 'Event',
-            'side': 'Side',
-            'confidence': 'Conf (1-10)',
-            'reason': 'AI Reasoning'
-        })
-        
-        # Select and Reorder columns to show only what matters
-        cols_to_show = ['Event', 'Side', 'Bet Size', 'Conf (1-10)', 'AI Reasoning']
-        final_cols = [c for c in cols_to_show if c in display_df.columns]
-        
-        # Display professional interactive table
-        st.dataframe(
-            display_df[final_cols], 
-            use_container_width=True, 
-            hide_index=True,
-            column_config={
-                "AI Reasoning": st.column_config.TextColumn("AI Reasoning", width="large"),
-            }
-        )
-    else:
-        st.warning("No bets met the criteria today.")
+                    st.session_state['last_run'] = time.strftime("%Y-%m-%d %H:%M:%S")
+                    st.success("Both Scans Complete!")
+
+                except Exception as e:
+                    st.error(f"Error: {e}")
 
-    # 3. Raw Logs (Hidden inside an expander)
-    with st.expander("🔍 View Raw Scout Data & Debug Logs"):
-        st.json(data)
+# --- MAIN DISPLAY AREA ---
+if st.session_state['results'] is not None:
+    # session_state['results'] maps a strategy label -> that run's results
+    views.render_runs(st.session_state['results'])
 
 else:
     # Default State
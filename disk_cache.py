@@ -0,0 +1,65 @@
+import os
+import time
+import hashlib
+import tempfile
+
+# --- LOCAL DISK CACHE ---
+# Small file-per-key store shared by the Scout (raw /events pages), the runner
+# (Scout snapshots) and the Researcher (AI picks), so re-running the bot can skip
+# network and AI calls.
+CACHE_DIR = os.path.expanduser("~/.cache/baddiebot")
+CACHE_MAX_AGE = 24 * 3600 # Files older than this are deleted; far beyond every caller's TTL
+
+pruned_dirs = set() # Namespaces already swept this process
+
+def cache_path(namespace, key):
+    """Maps a key string to its cache file (CACHE_DIR/namespace/<blake2b digest>.json)."""
+    digest = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+    return os.path.join(CACHE_DIR, namespace, digest + ".json")
+
+def read_cache(path, ttl):
+    """Returns the cached bytes if the file exists and is younger than ttl seconds, else None."""
+    try:
+        if time.time() - os.path.getmtime(path) > ttl:
+            return None
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+def prune_cache(directory):
+    """Deletes cache files (and stray temp files) older than CACHE_MAX_AGE. Runs once per directory per process."""
+    if directory in pruned_dirs:
+        return
+    pruned_dirs.add(directory)
+
+    cutoff = time.time() - CACHE_MAX_AGE
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
+                except OSError:
+                    pass # Raced with another process: it's gone either way
+    except OSError:
+        pass
+
+def write_cache(path, content):
+    """Stores bytes atomically (write to a unique temp file, then rename). Failures are ignored."""
+    directory = os.path.dirname(path)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        prune_cache(directory)
+
+        # mkstemp gives every writer (process or thread) its own temp file
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        except OSError:
+            os.remove(tmp_path)
+            raise
+    except OSError:
+        pass # The cache is only an optimisation
@@ -1,122 +1,247 @@
 import time
 import sys
+import json
+import heapq
+from datetime import datetime
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor
 import env
-import current_markets as scout       
-import research_strat as researcher
+import strategic_math
+import disk_cache
+# The Scout and Researcher (requests / OpenAI SDK) are imported on first use inside the
+# functions below, so importing main (e.g. a dashboard's first paint) stays cheap.
+
 # --- CONFIGURATION ---
 DAILY_BUDGET = env.MAX_BET_AMOUNT_CENTS  
 MIN_VOLUME = 500         
 MAX_RESEARCH_PER_CAT = 15  # Scaled back slightly for speed/stability
+DEFAULT_CATEGORIES = ["Sports", "Politics", "Economics"]
+SCOUT_CACHE_TTL = 300      # Seconds a Scout snapshot (per mode + categories) is reused across runs
+RESEARCH_WORKERS = 4       # Categories researched at the same time (each is one AI call)
+MIN_CONFIDENCE = 5         # Picks the AI itself rates below this (1-10) never reach the Advisor
+
+# The pick fields the Advisor reads, fetched in one C-level call per pick
+PICK_FIELDS = itemgetter('ticker', 'option_name', 'estimated_real_prob', 'market_price', 'confidence_score', 'reasoning')
+
+# Final report row: the '.30' / '.20' precisions truncate long titles/reasons in the format itself
+REPORT_ROW = "{:<30.30} | {:<5} | ${:<9.2f} | {:.20}..."
+
+def filter_liquid(markets, min_volume=MIN_VOLUME, top_n=MAX_RESEARCH_PER_CAT):
+    """
+    The markets worth an AI call: tradable price (1-99c), volume above min_volume,
+    each ticker once, and only the top_n by volume (prompt size and latency grow with
+    every market sent). One pass plus a bounded heap, before any prompt is built.
+    """
+    # Keyed by ticker, so a market listed twice (e.g. re-listed or under two events) is sent once
+    unique = {
+        m['ticker']: m for m in markets
+        if 1 <= m.get('yes_ask', 0) <= 99 and m.get('volume', 0) > min_volume
+    }
+    return heapq.nlargest(top_n, unique.values(), key=itemgetter('volume'))
 
-def run_advisor_bot(mode="standard"):
+def scout_snapshot(mode="standard", categories=None):
+    """
+    Runs just the Scout step for a mode, returning (fetched_at, markets).
+    fetched_at is when Kalshi was actually scanned, so a snapshot reused from disk
+    reports its real age (e.g. the dashboard rejects background results that are too old).
+    """
+    if categories is None:
+        categories = DEFAULT_CATEGORIES
+
+    # Rapid re-runs reuse the last snapshot instead of re-paginating Kalshi.
+    # Stored as JSON; daily markets' relevant_dt travels as an ISO string.
+    cache_path = disk_cache.cache_path("scout", f"{mode}|{','.join(sorted(categories))}")
+    cached = disk_cache.read_cache(cache_path, SCOUT_CACHE_TTL)
+    if cached is not None:
+        try:
+            snapshot = json.loads(cached)
+            markets = snapshot["markets"]
+            if isinstance(markets, list):
+                for m in markets:
+                    m["relevant_dt"] = datetime.fromisoformat(m["relevant_dt"])
+            print("📡 SCOUT: Reusing a recent market snapshot.")
+            return snapshot["fetched_at"], markets
+        except (ValueError, KeyError, TypeError):
+            pass # Corrupt or old-format snapshot: scan again
+
+    import current_markets as scout
+
+    fetched_at = time.time()
+
+    if mode == "daily":
+        # Daily mode fetches EVERYTHING expiring soon first
+        markets = scout.get_daily_markets(categories)
+    else:
+        # Standard mode lets the Scout handle the category filtering efficiently
+        markets = scout.fetch_current_kalshi_markets(categories, max_per_category=30)
+
+    # Empty scans (e.g. Kalshi errors) are never cached, so the next run retries
+    if markets:
+        snapshot = {"fetched_at": fetched_at, "markets": markets}
+        disk_cache.write_cache(cache_path, json.dumps(snapshot, default=datetime.isoformat).encode())
+    return fetched_at, markets
+
+def scout_markets(mode="standard", categories=None):
+    """
+    Runs just the Scout step for a mode. Exposed on its own so callers can run it
+    ahead of time and hand the result to run_advisor_bot.
+    """
+    return scout_snapshot(mode, categories)[1]
+
+def run_advisor_bot(mode="standard", categories=None, prefetched_markets=None, budget=None):
     """
     Main Runner.
-    mode="standard" -> Fetches specific categories (Politics, Econ).
-    mode="daily"    -> Fetches everything expiring in <24h.
+    
+    Args:
+        mode (str): "standard" (Category Search) or "daily" (Expiring <24h).
+        categories (list): Optional list of categories to filter by. 
+                           Default: DEFAULT_CATEGORIES
+        prefetched_markets: Optional result of scout_markets(mode, categories) fetched
+                            earlier; when given, the Scout step is skipped.
+        budget (int): Total stake in cents split across the picks. Default: DAILY_BUDGET
     """
     start_time = time.time()
     
-    # 1. INITIALIZE CONTEXT
+    # 1. SET DEFAULTS
+    if categories is None:
+        categories = DEFAULT_CATEGORIES
+    if budget is None:
+        budget = DAILY_BUDGET
+
+    # 2. INITIALIZE CONTEXT
     bot_context = {
-        'budget': DAILY_BUDGET,
+        'budget': budget,
         'raw_picks': [], 
         'final_orders': []
     }
 
-    print("\n" + "="*60)
-    print(f"🤖 BADDIE BOT ADVISOR: {mode.upper()} MODE (${DAILY_BUDGET/100:.2f})")
-    print("="*60 + "\n")
+    # Multi-line blocks are built in memory and written in one call (one write, never interleaved)
+    sys.stdout.write(
+        "\n" + "="*60 + "\n"
+        f"🤖 BADDIE BOT ADVISOR: {mode.upper()} MODE (${budget/100:.2f})\n"
+        f"🎯 Targets: {', '.join(categories)}\n"
+        + "="*60 + "\n\n"
+    )
 
     # ======================================================
     # STEP 1: SCOUT (Flexible Data Collection)
     # ======================================================
-    print("📡 SCOUT: Scanning Kalshi markets...")
-    
-
-    if mode == "daily":
-        # Might return a LIST of markets or a Dict
-        raw_data = scout.get_daily_markets()
+    if prefetched_markets is not None:
+        print("📡 SCOUT: Using markets prefetched in the background.")
+        raw_data = prefetched_markets
     else:
-        # Returns a DICT {'Politics': [...], 'Economics': [...]}
-        raw_data = scout.fetch_current_kalshi_markets(
-            ["Sports", "Politics", "Economics"], 
-            max_per_category=30
-        )
+        print("📡 SCOUT: Scanning Kalshi markets...")
+
+        try:
+            raw_data = scout_markets(mode, categories)
+        except Exception as e:
+            print(f"❌ CRITICAL SCOUT FAILURE: {e}")
+            return bot_context
+
     # ======================================================
-    # STEP 1.5: NORMALIZE DATA (The Robust Fix)
+    # STEP 1.5: NORMALIZE DATA
     # ======================================================
-    # We ensure 'market_data' is ALWAYS a Dictionary: {'Category': [List of Events]}
-    
     market_data = {}
 
     if isinstance(raw_data, list):
-        # If we got a flat list (e.g. from daily fetch), wrap it in a generic key
-        print(f"   ↳ Detected Flat List ({len(raw_data)} items). Normalizing...")
-        market_data['Daily_Movers'] = raw_data
-        
+        # Flat List (Daily Mode) -> Wrap in a generic key
+        if raw_data:
+            print(f"   ↳ Normalizing {len(raw_data)} items...")
+            market_data['Daily_Movers'] = raw_data
+        else:
+            print("   ⚠️ No markets found matching criteria.")
+            
     elif isinstance(raw_data, dict):
-        # If it's already a dict, just use it
+        # Dictionary (Standard Mode) -> Use as is
         market_data = raw_data
         
     else:
         print("❌ Error: Scout returned unknown data format.")
         return bot_context
 
+    # Only liquid, tradable markets are worth an AI call (see filter_liquid)
+    market_data = {category: filter_liquid(events) for category, events in market_data.items()}
+
     total_events = sum(len(v) for v in market_data.values())
-    print(f"   ↳ Ready to process {total_events} events across {len(market_data)} groups.")
+    if not total_events:
+        # Nothing survived the filters: skip the Researcher (and even loading it) entirely
+        print("\n😴 No events to analyze.")
+        return bot_context
+
+    print(f"   ↳ Ready to process {total_events} events.")
 
     # ======================================================
-    # STEP 2 & 3: FILTER & RESEARCH (Iterative Processing)
+    # STEP 2 & 3: RESEARCHER
     # ======================================================
     print(f"\n🧠 RESEARCHER: Analyzing opportunities...")
+    import research_strat as researcher
+
+    # --- AI RESEARCH ---
+    # Each category is an independent AI round-trip, so they are all sent at once
+    # and collected in category order (total wait ~ the slowest call, not the sum).
+    with ThreadPoolExecutor(max_workers=RESEARCH_WORKERS) as pool:
+        futures = {
+            category: pool.submit(researcher.research_event_group, category, events)
+            for category, events in market_data.items() if events
+        }
 
-    # Now this loop works perfectly for BOTH modes because we normalized it!
+    # The per-group report is collected and written as one block once every group is in
+    report = []
     for category, events in market_data.items():
-        print(f"\n📂 Processing Group: {category.upper()}")
+        if not events:
+            continue
 
-        target_events = market_data.get(category, [])
+        report.append(f"\n📂 Processing Group: {category.upper()}")
+        report.append(f"   ↳ Sent {len(events)} events to AI Researcher...")
 
-        if not target_events:
-            print(f"   ⚠️ Skipping: No liquid events found in {category}.")
-            continue
+        try:
+            # Drop low-confidence picks up front so the Advisor never formats them
+            cat_picks = [p for p in futures[category].result() if p['confidence_score'] >= MIN_CONFIDENCE]
             
-        print(f"   ↳ Sending {len(target_events)} events to AI Researcher...")
+            if cat_picks:
+                report.append(f"   ✅ Success: AI identified {len(cat_picks)} opportunities.")
+                bot_context['raw_picks'].extend(cat_picks)
+            else:
+                report.append(f"   🚫 Pass: AI found no edge.")
+                
+        except Exception as e:
+            report.append(f"   ❌ Error researching {category}: {e}")
+            continue
 
-        # --- B. AI RESEARCH ---
-        # We pass the cleaned list + category context to the AI
-        cat_picks = researcher.research_event_group(category, target_events)
-            
-        if cat_picks:
-            print(f"   ✅ Success: AI identified {len(cat_picks)} opportunities.")
-            bot_context['raw_picks'].extend(cat_picks)
-        else:
-            print(f"   🚫 Pass: AI found no edge.")
+    if report:
+        sys.stdout.write("\n".join(report) + "\n")
+        sys.stdout.flush()
 
     # ======================================================
-    # STEP 4: ADVISOR (Format & Return)
+    # STEP 4: ADVISOR
     # ======================================================
     if bot_context['raw_picks']:
-        print(f"\n⚡ ADVISOR: Formatting {len(bot_context['raw_picks'])} picks for Dashboard...")
+        print(f"\n⚡ ADVISOR: Formatting {len(bot_context['raw_picks'])} picks...")
         
-        formatted_orders = []
-        for pick in bot_context['raw_picks']:
-            # Calculate Edge
-            real_prob = pick.get('estimated_real_prob', 0)
-            market_price = pick.get('market_price', 0)
-            edge = real_prob - market_price
-            
-            # Format
-            formatted_orders.append({
-                'ticker': pick.get('ticker'),
-                'title': pick.get('option_name'), 
+        # Sort by Confidence Score (Descending); the surest picks also keep priority on rounding leftovers
+        picks = sorted(bot_context['raw_picks'], key=itemgetter('confidence_score'), reverse=True)
+
+        fields = [PICK_FIELDS(p) for p in picks]
+
+        # Quarter-Kelly stakes in dollars, sized together against the whole budget
+        # (0 when the edge is under 5 points or the price is not a tradable 1-99c; those are dropped)
+        stakes = strategic_math.allocate_kelly_bets(
+            [(real_prob / 100, market_price) for _, _, real_prob, market_price, _, _ in fields], budget / 100
+        )
+
+        bot_context['final_orders'] = [
+            {
+                'ticker': ticker,
+                'title': name, 
                 'side': "YES",
-                'suggested_bet': edge, 
-                'confidence': pick.get('confidence_score', 0),
-                'reason': f"Implied: {market_price}% vs Real: {real_prob}% | {pick.get('reasoning')}"
-            })
-            
-        formatted_orders.sort(key=lambda x: x['confidence'], reverse=True)
-        bot_context['final_orders'] = formatted_orders
+                'suggested_bet': round(stake * 100), # Cents
+                'confidence': confidence,
+                'reason': f"Implied: {market_price}% vs Real: {real_prob}% | {reasoning}"
+            }
+            for (ticker, name, real_prob, market_price, confidence, reasoning), stake in zip(fields, stakes)
+            if stake # No edge, untradable price or squeezed out of the budget: not an order
+        ]
+        
     else:
         print("\n😴 ADVISOR: No picks found to display.")
 
@@ -125,5 +250,28 @@ def run_advisor_bot(mode="standard"):
     
     return bot_context
 
+def print_final_report(bot_context):
+    """Prints the final orders as one table, built in memory and written in a single call."""
+    lines = [
+        "\n🚀 FINAL STRATEGY REPORT",
+        "-" * 65,
+        f"{'MARKET / OPTION':<30} | {'SIDE':<5} | {'BET SIZE':<10} | REASON",
+        "-" * 65
+    ]
+
+    lines.extend(
+        REPORT_ROW.format(str(rec['title']), rec['side'], rec['suggested_bet'] / 100, rec['reason'])
+        for rec in bot_context['final_orders']
+    )
+
+    if not bot_context['final_orders']:
+        lines.append("(No bets met the criteria.)")
+
+    sys.stdout.write("\n".join(lines) + "\n")
+
+# --- EXAMPLE USAGE ---
 if __name__ == "__main__":
-    run_advisor_bot('daily')
\ No newline at end of file
+    print_final_report(run_advisor_bot('daily'))
+
+    # Example: Run standard mode but ONLY for Politics
+    # run_advisor_bot('standard', categories=["Politics"])
\ No newline at end of file
@@ -1,55 +1,210 @@
+import atexit
+import csv
+import io
 import json
 import re
-import httpx
-from openai import OpenAI
+import time
+import threading
+from collections import OrderedDict
+from operator import itemgetter
 import env 
+import disk_cache
 
-# Initialize Perplexity Client
-client = OpenAI(
-    api_key=env.PERPLEXITY_API_KEY,
-    base_url="https://api.perplexity.ai",
-    http_client=httpx.Client(timeout=300.0) # Increased timeout for deep thinking
-)
+# orjson parses replies / cached picks several times faster and dumps straight to bytes;
+# stdlib json stays in use for the tolerant fallback extraction and debug prints
+try:
+    import orjson
+    json_loads = orjson.loads
+    json_dumps = orjson.dumps
+except ImportError:
+    json_loads = json.loads
+    def json_dumps(obj):
+        return json.dumps(obj).encode()
 
-def research_event_group(category, market_list):
-    """
-    Analyzes a list of specific market options using Perplexity/Sonar.
-    
-    Args:
-        category (str): The category name (e.g., 'Politics')
-        market_list (list): A list of market dictionaries from the Scout module.
-                            Expected keys: 'option_name', 'ticker', 'yes_ask', 'event_title'
+# --- PERPLEXITY CLIENT ---
+# One client (and one keep-alive pool) for the whole process, shared by every research strategy.
+# The OpenAI SDK and httpx are only imported when the first AI call is made, so importing
+# this module (strategy tables, cache hits) doesn't pay their startup cost.
+client = None
+client_lock = threading.Lock() # Categories are researched from several threads
+
+# At most this many AI calls in flight per process (e.g. the dashboard's "Both" runs two
+# advisors at once), so a burst can't trip Perplexity's rate limit. Throttled (429) and
+# 5xx replies are retried by the SDK itself with exponential backoff + jitter.
+MAX_CONCURRENT_AI_CALLS = 4
+MAX_AI_RETRIES = 4
+ai_call_slots = threading.BoundedSemaphore(MAX_CONCURRENT_AI_CALLS)
+
+def get_client():
+    """Returns the shared Perplexity client, building it on first use."""
+    global client
+    with client_lock:
+        if client is None:
+            import httpx
+            from openai import OpenAI
+
+            # HTTP/2 lets the concurrent category calls share one TLS connection to Perplexity.
+            # It needs the optional 'h2' package (pip install httpx[http2]); without it we stay on HTTP/1.1.
+            try:
+                import h2
+                http2 = True
+            except ImportError:
+                http2 = False
+
+            client = OpenAI(
+                api_key=env.PERPLEXITY_API_KEY,
+                base_url="https://api.perplexity.ai",
+                max_retries=MAX_AI_RETRIES,
+                http_client=httpx.Client(
+                    timeout=300.0, # Increased timeout for deep thinking
+                    http2=http2,
+                    limits=httpx.Limits(max_keepalive_connections=8, max_connections=16)
+                )
+            )
+            # Close the pooled connections cleanly when the process exits
+            atexit.register(client.close)
+    return client
+
+RESEARCH_MODEL = "sonar-pro"
+
+# --- RESEARCH CACHE ---
+# Picks are cached on disk keyed by the request (model + both prompts), so the same
+# market list inside the TTL skips the AI call entirely, across runs, and any prompt
+# edit automatically misses. Prices in the key are snapped to PRICE_BUCKET cents, so a
+# 1-2c wiggle between runs still reuses the analysis.
+RESEARCH_CACHE_TTL = 1800 # Seconds cached picks are reused
+PROMPT_VERSION = 1        # Bump when pick parsing/normalization changes (prompt edits invalidate on their own)
+PRICE_BUCKET = 5          # Cents
+
+def research_cache_key(system_prompt, user_prompt):
+    """Everything the AI sees (with bucketed prices), plus the parser version."""
+    return f"v{PROMPT_VERSION}|{RESEARCH_MODEL}|{system_prompt}|{user_prompt}"
+
+# In-process LRU in front of the disk cache: a repeat call in the same process
+# (dashboard reruns, debugging) skips even the file read and JSON decode.
+MEMORY_CACHE_SIZE = 128
+memory_cache = OrderedDict() # cache key -> (stored_at, picks), least recently used first
+memory_cache_lock = threading.Lock() # Categories are researched from several threads
+
+def recall_picks(key):
+    """Fresh picks for key from the in-process cache (as copies), else None."""
+    with memory_cache_lock:
+        entry = memory_cache.get(key)
+        if entry is None or time.time() - entry[0] > RESEARCH_CACHE_TTL:
+            return None
+        memory_cache.move_to_end(key)
+    return [dict(p) for p in entry[1]]
+
+def remember_picks(key, picks):
+    """Stores picks in the in-process cache, evicting the least recently used entries."""
+    with memory_cache_lock:
+        memory_cache[key] = (time.time(), [dict(p) for p in picks])
+        memory_cache.move_to_end(key)
+        while len(memory_cache) > MEMORY_CACHE_SIZE:
+            memory_cache.popitem(last=False)
+
+# Canonical pick key -> (alternate name the model sometimes uses, default)
+PICK_KEY_ALIASES = {
+    'ticker': ('market_ticker', 'N/A'),
+    'option_name': ('pick_name', 'Unknown'),
+    'market_price': ('market_implied_prob', 0),
+    'estimated_real_prob': ('real_prob', 0),
+    'confidence_score': ('confidence', 0),
+    'reasoning': ('analysis', 'No reason given.'),
+}
+
+# Structured output: the API constrains the reply to this shape, so it parses directly.
+# (The extraction below stays as a fallback for replies that still carry extra text.)
+PICKS_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "schema": {
+            "type": "object",
+            "properties": {
+                "picks": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "ticker": {"type": "string"},
+                            "option_name": {"type": "string"},
+                            "market_price": {"type": "number"},
+                            "estimated_real_prob": {"type": "number"},
+                            "confidence_score": {"type": "number"},
+                            "reasoning": {"type": "string"}
+                        },
+                        "required": ["ticker", "market_price", "estimated_real_prob", "confidence_score"]
+                    }
+                }
+            },
+            "required": ["picks"]
+        }
+    }
+}
+
+# Compiled once at import instead of on every response
+THINK_BLOCK_RE = re.compile(r'<think>.*?</think>', re.DOTALL)
+JSON_DECODER = json.JSONDecoder()
+
+def parse_picks_json(raw_content):
+    """Returns the reply's JSON object, or None if there is none."""
+    # Fast path: a structured-output reply is the JSON object itself
+    try:
+        return json_loads(raw_content)
+    except ValueError:
+        pass
+
+    # Remove any <think> blocks if the model outputs them
+    clean_content = THINK_BLOCK_RE.sub('', raw_content)
     
-    Returns:
-        list: A list of the top 5 recommendation dictionaries.
+    # Decode the first complete JSON object (handles if model adds extra text).
+    # raw_decode stops at the object's closing brace, so trailing chatter is never scanned.
+    start = clean_content.find('{')
+    while start != -1:
+        try:
+            return JSON_DECODER.raw_decode(clean_content, start)[0]
+        except ValueError:
+            start = clean_content.find('{', start + 1)
+    return None
+
+def normalize_pick(pick, category):
     """
-    if not market_list:
-        return []
+    Fills every canonical pick key once, from its alias or a default,
+    so the Advisor and reports can index picks directly instead of chaining fallbacks.
+    """
+    for key, (alias, default) in PICK_KEY_ALIASES.items():
+        if not pick.get(key):
+            pick[key] = pick.get(alias) or default
 
-    print(f"   > 🧠 Analyzing {len(market_list)} betting options in '{category}'...")
+    # Add the category back to the pick for the Advisor to see
+    pick['category'] = category
+    return pick
 
-    # 1. Format the data for the AI context
-    # We strip unnecessary data to save tokens and keep the AI focused.
-    context_text = ""
-    for m in market_list:
-        # Calculate implied probability from the 'ask' price (cost to buy)
-        price = m.get('yes_ask', 0)
-        
-        # Skip invalid prices (0 or >99)
-        if price < 1 or price > 99: 
+def reprice_picks(picks, market_list):
+    """
+    Resets each pick's market_price to the current yes_ask before the Advisor sizes it,
+    whether the pick is fresh (the model may misquote the price) or cached (the cache key
+    is price-bucketed). Picks whose ticker is not in market_list are dropped.
+    """
+    current_prices = {m['ticker']: m.get('yes_ask', 0) for m in market_list}
+    repriced = []
+    for pick in picks:
+        price = current_prices.get(pick['ticker'])
+        if price is None:
             continue
-            
-        context_text += (
-            f"- Event: {m['event_title']} | Option: {m['option_name']} | "
-            f"Ticker: {m['ticker']} | Price (Implied %): {price}%\n"
-        )
+        pick['market_price'] = price
+        repriced.append(pick)
+    return repriced
 
-    # 2. Construct the Analysis Prompt
-    system_prompt = f"""
+# --- RESEARCH STRATEGIES ---
+# One researcher, several prompts. Each strategy sets the system prompt, the closing ask,
+# the price band (in cents) worth showing the AI, and the lowest confidence it keeps.
+VALUE_SYSTEM_PROMPT = """
     You are a professional prediction market analyst (Kalshi/Polymarket expert).
     
     YOUR TASK:
-    Analyze the provided list of betting options for the category '{category}'.
+    Analyze the provided list of betting options for the category named by the user.
+    The list is CSV with columns: event,option,ticker,price_pct (price_pct = price in cents = implied %).
     Identify exactly the TOP 10 "Value Bets" where the market is WRONG.
     
     METHODOLOGY:
@@ -63,54 +218,220 @@ def research_event_group(category, market_list):
     
     OUTPUT FORMAT (JSON ONLY):
     Return a valid JSON object containing a list named "picks".
-    {{
+    {
         "picks": [
-            {{
+            {
                 "ticker": "TICKER_HERE",
                 "option_name": "Name of option",
                 "market_price": 30,
                 "estimated_real_prob": 55,
                 "confidence_score": 8,
                 "reasoning": "Polls show candidate leading by 5 points, but market prices them as an underdog. Momentum is shifting favorable."
-            }}
+            }
+        ]
+    }
+    """
+
+SAFE_YIELD_SYSTEM_PROMPT = """
+    You are a risk-averse arbitrage trader for prediction markets.
+    
+    YOUR GOAL:
+    Find "Free Money" opportunities. Do NOT look for risky underdogs or contrarian bets.
+    Look for outcomes that are ALMOST CERTAIN to happen, but the market is still pricing them with doubt.
+    The list is CSV with columns: event,option,ticker,price_pct (price_pct = price in cents = implied %).
+    
+    METHODOLOGY (SAFE YIELD HUNTING):
+    1. Ignore "Long Shots" (prices under 20c) unless breaking news confirms them 100%.
+    2. Focus on "Mispriced Favorites": 
+       - Example: An event is priced at 75c (75%) but reality says it's 95% certain.
+       - This is a safe 1.3x return.
+    3. Your "Real World Probability" should reflect FACTS, not speculation.
+    
+    SCORING:
+    - Confidence Score (1-10): Rate strictly on SAFETY. 
+       - 10 = The event has effectively already happened (Free Money).
+       - 1 = It's a coin toss (Avoid).
+    
+    OUTPUT FORMAT (JSON ONLY):
+    {
+        "picks": [
+            {
+                "ticker": "TICKER",
+                "option_name": "Option Name",
+                "market_price": 75,
+                "estimated_real_prob": 90,
+                "confidence_score": 9,
+                "reasoning": "Polls and news confirm this is a lock. Market is lagging. Easy 20% yield."
+            }
         ]
-    }}
+    }
     """
+
+HOLDING_CHECK_SYSTEM_PROMPT = """
+    You are a prediction market analyst reviewing positions someone ALREADY HOLDS.
+    
+    YOUR TASK:
+    For EVERY market in the provided list, give your honest real-world probability of YES,
+    whether it is above or below the market price. Do not skip markets and do not hunt for value.
+    The list is CSV with columns: event,option,ticker,price_pct (price_pct = price in cents = implied %).
     
-    user_prompt = (
-        f"Here are the active markets for {category}:\n\n"
-        f"{context_text}\n\n"
-        f"Based on real-world data, return the Top 10 best value plays in JSON format."
-    )
+    METHODOLOGY:
+    1. "Implied Probability" is simply the Price (e.g., 30c = 30%).
+    2. "Real World Probability" is your estimation based on the latest news, polls, and data.
+    3. Summarize the most recent news that moves the odds.
+    
+    SCORING:
+    - Confidence Score: 1 (Low) to 10 (High).
+    - Explanation: Max 3 concise sentences on the latest developments.
+    
+    OUTPUT FORMAT (JSON ONLY):
+    {
+        "picks": [
+            {
+                "ticker": "TICKER",
+                "option_name": "Option Name",
+                "market_price": 60,
+                "estimated_real_prob": 45,
+                "confidence_score": 7,
+                "reasoning": "Key witness testimony was delayed. Market still prices the earlier timeline."
+            }
+        ]
+    }
+    """
+
+# Only the category, the CSV table and the strategy's ask vary between calls
+USER_PROMPT_TEMPLATE = "Here are the active markets for {category}:\n\n{context}\n{ask}"
+
+STRATEGIES = {
+    # Contrarian value: anywhere the market is wrong
+    "value": {
+        "system_prompt": VALUE_SYSTEM_PROMPT,
+        "ask": "Based on real-world data, return the Top 10 best value plays in JSON format.",
+        "min_price": 1,
+        "max_price": 99,
+        "min_confidence": 0
+    },
+    # "Free money": near-certain favorites still priced with doubt.
+    # Higher prices are allowed because free money often hides in the 80c-90c range.
+    "safe_yield": {
+        "system_prompt": SAFE_YIELD_SYSTEM_PROMPT,
+        "ask": "Identify the Top 10 safest, high-probability plays.",
+        "min_price": 5,
+        "max_price": 96,
+        "min_confidence": 6 # Force high confidence only for this strategy
+    },
+    # Portfolio watch: one honest estimate per held market, edge or not
+    "holding_check": {
+        "system_prompt": HOLDING_CHECK_SYSTEM_PROMPT,
+        "ask": "Return your real-world probability for every market listed, in JSON format.",
+        "min_price": 1,
+        "max_price": 99,
+        "min_confidence": 0
+    }
+}
+
+def research_event_group(category, market_list, strategy="value"):
+    """
+    Analyzes a list of specific market options using Perplexity/Sonar.
+    
+    Args:
+        category (str): The category name (e.g., 'Politics')
+        market_list (list): A list of market dictionaries from the Scout module.
+                            Expected keys: 'option_name', 'ticker', 'yes_ask', 'event_title'
+        strategy (str): A key of STRATEGIES ('value', 'safe_yield' or 'holding_check')
+    
+    Returns:
+        list: A list of the top 5 recommendation dictionaries.
+    """
+    if not market_list:
+        return []
+
+    spec = STRATEGIES[strategy]
+    min_price, max_price = spec['min_price'], spec['max_price']
+
+    # 1. Format the data for the AI context
+    # We strip unnecessary data to save tokens and keep the AI focused.
+    # Rows are ordered by ticker so the same markets always produce the same prompt (and cache key).
+    # Sent as compact CSV (one header instead of labels on every row = far fewer tokens);
+    # csv.writer quotes titles that contain commas or quotes.
+    # A twin table with prices snapped to PRICE_BUCKET is built alongside, for the cache key only.
+    buffer, key_buffer = io.StringIO(), io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    key_writer = csv.writer(key_buffer, lineterminator="\n")
+    writer.writerow(("event", "option", "ticker", "price_pct"))
+    rows = 0
+    for m in sorted(market_list, key=itemgetter('ticker')):
+        # Calculate implied probability from the 'ask' price (cost to buy)
+        price = m.get('yes_ask', 0)
+        
+        # Skip prices outside the strategy's band (always within the tradable 1-99c)
+        if price < min_price or price > max_price: 
+            continue
+            
+        row = [m['event_title'], m['option_name'], m['ticker'], price]
+        writer.writerow(row)
+        row[3] = round(price / PRICE_BUCKET) * PRICE_BUCKET
+        key_writer.writerow(row)
+        rows += 1
+    context_text = buffer.getvalue()
+
+    # Nothing inside the strategy's price band: no point asking the AI about an empty table
+    if not rows:
+        return []
+
+    # 2. Construct the Analysis Prompt
+    # The system prompt is identical for every category (the category is named in the
+    # user prompt), so the provider can reuse its prefill across the per-category calls.
+    system_prompt = spec['system_prompt']
+    user_prompt = USER_PROMPT_TEMPLATE.format(category=category, context=context_text, ask=spec['ask'])
+
+    key_prompt = USER_PROMPT_TEMPLATE.format(category=category, context=key_buffer.getvalue(), ask=spec['ask'])
+    cache_key = research_cache_key(system_prompt, key_prompt)
+    picks = recall_picks(cache_key)
+    if picks is not None:
+        print(f"   > 💾 Reusing cached analysis for '{category}' ({len(market_list)} options).")
+        return reprice_picks(picks, market_list)
+
+    cache_path = disk_cache.cache_path("research", cache_key)
+    cached = disk_cache.read_cache(cache_path, RESEARCH_CACHE_TTL)
+    if cached is not None:
+        try:
+            picks = json_loads(cached)
+        except ValueError:
+            picks = None # Corrupt file: fall through and re-ask the AI
+        if picks is not None:
+            print(f"   > 💾 Reusing cached analysis for '{category}' ({len(market_list)} options).")
+            remember_picks(cache_key, picks)
+            return reprice_picks(picks, market_list)
+
+    print(f"   > 🧠 Analyzing {len(market_list)} betting options in '{category}'...")
 
     try:
         # Call Perplexity Sonar-Pro (or Medium) for reasoning
-        response = client.chat.completions.create(
-            model="sonar-pro", 
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=0.1 # Low temp for factual consistency
-        )
-        
-        # 3. Clean & Parse Response
-        raw_content = response.choices[0].message.content
+        with ai_call_slots:
+            response = get_client().chat.completions.create(
+                model=RESEARCH_MODEL, 
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                temperature=0.1, # Low temp for factual consistency
+                response_format=PICKS_RESPONSE_FORMAT
+            )
         
-        # Remove any <think> blocks if the model outputs them
-        clean_content = re.sub(r'<think>.*?</think>', '', raw_content, flags=re.DOTALL)
+        # 3. Parse Response
+        data = parse_picks_json(response.choices[0].message.content)
         
-        # Extract JSON using regex (handles if model adds extra text)
-        json_match = re.search(r'(\{.*\})', clean_content, re.DOTALL)
-        
-        if json_match:
-            data = json.loads(json_match.group(1))
-            picks = data.get('picks', [])
-            
-            # Post-processing: Add the category back to the pick for the Advisor to see
-            for p in picks:
-                p['category'] = category
-                
+        if isinstance(data, dict):
+            # Post-processing: one stable schema for every pick
+            picks = [normalize_pick(p, category) for p in data.get('picks', [])]
+            picks = [p for p in picks if p['confidence_score'] >= spec['min_confidence']]
+            picks = reprice_picks(picks, market_list) # Same prices and tickers as a cache hit would give
+
+            # Only real answers are cached; failures and empty replies are retried next run
+            if picks:
+                disk_cache.write_cache(cache_path, json_dumps(picks))
+                remember_picks(cache_key, picks)
             return picks
             
         else:
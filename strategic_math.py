@@ -1,7 +1,14 @@
-import math
 import env
 
-def calculate_kelly_bet(ai_probability, market_price_cents, bankroll, daily_limit_remaining, kelly_fraction=0.25):
+# --- SIZING CONSTANTS ---
+# Read once at import, so the per-pick math never goes back to env or re-derives them
+DAILY_BUDGET_CENTS = env.MAX_BET_AMOUNT_CENTS
+KELLY_FRACTION = 0.25 # Quarter-Kelly: standard safety multiplier to avoid ruin
+MIN_EDGE = 0.05       # Minimum 5% edge (AI prob over market prob) required to trade
+MIN_EDGE_POINTS = MIN_EDGE * 100 # Same, in percentage points / cents
+MIN_BET_CENTS = 100   # Minimum bet is usually roughly $1-$2 to make it worth it
+
+def calculate_kelly_bet(ai_probability, market_price_cents, bankroll, daily_limit_remaining, kelly_fraction=KELLY_FRACTION):
     """
     Calculates the optimal bet size based on edge, constrained by bankroll and daily limits.
     
@@ -13,15 +20,19 @@ def calculate_kelly_bet(ai_probability, market_price_cents, bankroll, daily_limi
         kelly_fraction (float): Safety multiplier (0.25 is standard to avoid ruin)
     """
     
-    market_prob = market_price_cents / 100.0
-    
-    # 1. Check if we actually have an edge
-    if ai_probability <= (market_prob + 0.05): # Minimum 5% edge required to trade
+    # 0. Only 1-99c contracts are tradable (a 0c/100c price would also divide by zero below)
+    if not 1 <= market_price_cents <= 99:
+        return 0, 0
+
+    # 1. Check if we actually have an edge (in percentage points, against the price in cents)
+    # Rounded so float noise can't decide the exact 5-point boundary (0.55 * 100 = 55.00000000000001)
+    ai_points = round(ai_probability * 100, 6)
+    if ai_points <= market_price_cents + MIN_EDGE_POINTS: # Minimum 5% edge required to trade
         return 0, 0
         
     # 2. Kelly Criterion for Binary Options
-    # Formula: f = (p - q/b) simplified to (p - price) / (1 - price)
-    kelly_percentage = (ai_probability - market_prob) / (1 - market_prob)
+    # Formula: f = (p - q/b) simplified to (p - price) / (1 - price), scaled to cents
+    kelly_percentage = (ai_points - market_price_cents) / (100 - market_price_cents)
     
     # 3. Apply Fractional Kelly (Safety)
     safe_kelly = kelly_percentage * kelly_fraction
@@ -31,30 +42,73 @@ def calculate_kelly_bet(ai_probability, market_price_cents, bankroll, daily_limi
     
     # 5. Apply Constraints
     # Constraint A: Cannot bet more than daily limit remaining
-    bet_amount = min(raw_bet_amount, daily_limit_remaining)
+    # (from here on in whole cents: exact integer math. Rounded, not truncated, so float
+    # noise like 2.9999999 doesn't cost a cent - but never rounded up past the limit)
+    limit_cents = round(daily_limit_remaining * 100, 6) # Drops float noise, keeps real fractions
+    bet_cents = round(min(raw_bet_amount * 100, limit_cents))
+    if bet_cents > limit_cents:
+        bet_cents = int(limit_cents)
     
     # Constraint B: Minimum bet is usually roughly $1-$2 to make it worth it
-    if bet_amount < 1.00:
+    if bet_cents < MIN_BET_CENTS:
         return 0, 0
 
     # 6. Calculate Contract Count
-    # Price is in cents, so we convert dollars to cents
-    contract_price_dollars = market_price_cents / 100.0
-    count = math.floor(bet_amount / contract_price_dollars)
+    # Price is in cents, so whole contracts are a floor division
+    count = int(bet_cents // market_price_cents)
     
-    return count, round(count * contract_price_dollars, 2)
+    return count, count * market_price_cents / 100
 
-def get_advisor_recommendations(research_results, total_daily_budget=env.MAX_BET_AMOUNT_CENTS):
+def allocate_kelly_bets(bets, bankroll, kelly_fraction=KELLY_FRACTION):
+    """
+    Sizes several independent binary bets together, so they share one bankroll.
+    
+    Args:
+        bets (list): (ai_probability, market_price_cents) pairs, highest priority first
+        bankroll (float): Total funds in dollars for all the bets together
+        kelly_fraction (float): Safety multiplier passed to calculate_kelly_bet
+    
+    Returns:
+        list: The dollar stake for each bet, in order (0 = no edge or untradable price).
+    """
+    def sized(active, scaled_bankroll, remaining):
+        stakes = []
+        for ai_probability, price in active:
+            _, stake = calculate_kelly_bet(ai_probability, price, scaled_bankroll, remaining, kelly_fraction)
+            remaining -= stake
+            stakes.append(stake)
+        return stakes
+
+    # 1. What each bet would take on its own; only bets with a stake compete for the budget
+    own_stakes = sized(bets, bankroll, float("inf"))
+    active = [i for i, stake in enumerate(own_stakes) if stake]
+
+    # 2. Oversubscribed: shrink every stake by the same factor instead of letting the
+    # first picks take it all; the remaining-budget cap only trims rounding leftovers.
+    # If shrinking pushes any stake under the minimum bet, the lowest-priority bet is
+    # dropped and the rest re-scaled, so the budget goes to fewer, real bets instead of none.
+    stakes = [0] * len(bets)
+    while active:
+        demand = sum(own_stakes[i] for i in active)
+        scale = min(1.0, bankroll / demand)
+        scaled = sized([bets[i] for i in active], bankroll * scale, bankroll)
+        if all(scaled) or len(active) == 1:
+            for i, stake in zip(active, scaled):
+                stakes[i] = stake
+            break
+        active.pop()
+    return stakes
+
+def get_advisor_recommendations(research_results, total_daily_budget=DAILY_BUDGET_CENTS):
     """
     Distributes a fixed budget across researched markets based on 'Edge'.
     
     research_results: A list of dicts containing {ticker, question, ai_prob, market_prob}
-    total_daily_budget: Your parameter (default $10)
+    total_daily_budget: Your parameter, in cents (default $10 = 1000)
     """
     
     # 1. Calculate the 'Edge' for each market (Difference between AI and Market)
     active_opportunities = []
-    total_edge_points = 0
     
     for res in research_results:
         # Only look at BUY recommendations
@@ -65,16 +119,27 @@ def get_advisor_recommendations(research_results, total_daily_budget=env.MAX_BET
             # Absolute edge (e.g., AI says 70%, Market says 50%, Edge = 0.20)
             edge = max(0, abs(ai_prob - market_prob))
             
-            if edge > 0.05: # Minimum 5% edge to even consider it
+            if edge > MIN_EDGE: # Minimum 5% edge to even consider it
                 res['edge_score'] = edge
                 active_opportunities.append(res)
-                total_edge_points += edge
 
     if not active_opportunities:
         return "🚫 No strong edges found today. Keep your $10."
 
+    # 1.5 Keep only the top-K edges that can each still get the minimum bet.
+    # Sorted by edge, the K-th market gets the smallest share of the first K, so K grows
+    # while that share stays >= the minimum; thinner edges would be diluted below it.
+    # (Budget and minimum are both in cents.)
+    active_opportunities.sort(key=lambda r: r['edge_score'], reverse=True)
+    top_k, total_edge_points, running_edge = 1, active_opportunities[0]['edge_score'], 0
+    for k, op in enumerate(active_opportunities, 1):
+        running_edge += op['edge_score']
+        if total_daily_budget * op['edge_score'] / running_edge >= MIN_BET_CENTS:
+            top_k, total_edge_points = k, running_edge
+    del active_opportunities[top_k:]
+
     # 2. Distribute the $10 budget proportionally to the edge
-    print(f"🎯 ADVISOR REPORT: Distributing ${total_daily_budget} across {len(active_opportunities)} markets\n")
+    print(f"🎯 ADVISOR REPORT: Distributing ${total_daily_budget / 100:.2f} across {len(active_opportunities)} markets\n")
     
     recommendations = []
     for op in active_opportunities:
@@ -85,7 +150,7 @@ def get_advisor_recommendations(research_results, total_daily_budget=env.MAX_BET
         recommendations.append({
             "ticker": op['market']['ticker'],
             "question": op['market']['question'],
-            "suggested_bet": f"${suggested_spend:.2f}",
+            "suggested_bet": f"${suggested_spend / 100:.2f}",
             "reason": op['analysis']['reasoning'],
             "confidence": op['analysis']['confidence']
         })
@@ -12,9 +12,7 @@ except ImportError as e:
     sys.exit(1)
 
 def run_real_politics_test():
-    print("\n" + "="*60)
-    print("🤖 BADDIE BOT: Live Politics Test Mode")
-    print("="*60 + "\n")
+    sys.stdout.write("\n" + "="*60 + "\n🤖 BADDIE BOT: Live Politics Test Mode\n" + "="*60 + "\n\n")
 
     # 1. DEFINE TEST PARAMETERS
     # We only want 'Politics' and we only want the top 15 most liquid options to save time/tokens.
@@ -53,27 +51,27 @@ def run_real_politics_test():
         return
 
     # 4. DISPLAY RESULTS
-    print("\n" + "-"*60)
-    print("🚀 FINAL RESULTS (Live Data)")
-    print("-" * 60)
+    # The whole report is built in memory and written in a single call
+    lines = ["\n" + "-"*60, "🚀 FINAL RESULTS (Live Data)", "-" * 60]
 
     if not recommendations:
-        print("🤷‍♂️ AI Result: No high-value edges found (or AI refused to bet).")
+        lines.append("🤷‍♂️ AI Result: No high-value edges found (or AI refused to bet).")
     else:
         for i, rec in enumerate(recommendations, 1):
-            # Handle potential key name variations safely
-            name = rec.get('option_name') or rec.get('pick_name', 'Unknown')
-            price = rec.get('market_price') or rec.get('market_implied_prob', 0)
-            real_prob = rec.get('estimated_real_prob', 0)
-            conf = rec.get('confidence_score') or rec.get('confidence', 0)
-            reason = rec.get('reasoning') or rec.get('analysis', 'No reason given.')
+            # Key variations are already normalized by the researcher
+            name = rec['option_name']
+            price = rec['market_price']
+            real_prob = rec['estimated_real_prob']
+            conf = rec['confidence_score']
+            reason = rec['reasoning']
 
-            print(f"{i}. OPTION: {name} ({rec.get('ticker', 'N/A')})")
-            print(f"   💰 Price: {price}¢  vs  🧠 Real Prob: {real_prob}%")
-            print(f"   🔥 Confidence: {conf}/10")
-            print(f"   📝 Reason: {reason}\n")
+            lines.append(f"{i}. OPTION: {name} ({rec['ticker']})")
+            lines.append(f"   💰 Price: {price}¢  vs  🧠 Real Prob: {real_prob}%")
+            lines.append(f"   🔥 Confidence: {conf}/10")
+            lines.append(f"   📝 Reason: {reason}\n")
 
-    print("✅ TEST COMPLETE.")
+    lines.append("✅ TEST COMPLETE.")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 if __name__ == "__main__":
     run_real_politics_test()
\ No newline at end of file
@@ -0,0 +1,57 @@
+import strategic_math
+
+# Offline checks for the bet-sizing math (no API calls).
+# Run with: python -m pytest test_strategic_math.py  (or: python test_strategic_math.py)
+
+def test_oversubscribed_budget_still_places_min_bets():
+    # 20 identical strong picks on a $10 budget: scaling all 20 evenly would push every
+    # stake under the $1 minimum, so the lowest-priority picks must be dropped instead
+    stakes = strategic_math.allocate_kelly_bets([(0.9, 20)] * 20, 10)
+
+    placed = [s for s in stakes if s]
+    assert placed, "oversubscribed budget allocated nothing"
+    assert all(s >= strategic_math.MIN_BET_CENTS / 100 for s in placed)
+    assert sum(stakes) <= 10
+    assert sum(stakes) >= 9 # The budget is (nearly) all used
+
+    # Priority order is respected: placed bets are a prefix of the list
+    assert stakes[:len(placed)] == placed
+
+def test_undersubscribed_budget_keeps_own_stakes():
+    stakes = strategic_math.allocate_kelly_bets([(0.9, 20), (0.5, 50), (0.9, 0)], 10)
+    assert stakes == [2.0, 0, 0]
+
+def test_bet_rounds_to_whole_cents_within_limit():
+    # $3 left after float arithmetic (0.1 + 0.2 style noise) still buys 15 contracts at 20c
+    assert strategic_math.calculate_kelly_bet(0.9, 20, 100, 3 - 1e-12) == (15, 3.0)
+    # A genuinely fractional limit is never rounded up past what is left
+    assert strategic_math.calculate_kelly_bet(0.9, 20, 100, 2.996) == (14, 2.8)
+
+def test_exact_min_edge_is_rejected():
+    # An edge of exactly MIN_EDGE is not enough, whatever float noise 0.55 * 100 carries
+    assert strategic_math.calculate_kelly_bet(0.55, 50, 100, 10) == (0, 0)
+    assert strategic_math.calculate_kelly_bet(0.57, 52, 100, 10) == (0, 0)
+    assert strategic_math.calculate_kelly_bet(0.56, 50, 100, 10) != (0, 0)
+
+def test_advisor_keeps_only_edges_that_clear_the_min_bet():
+    # 30 equal 20-point edges on the default budget (cents): only as many as can each get
+    # MIN_BET_CENTS are kept
+    results = [
+        {
+            'analysis': {'verdict': "BUY", 'my_estimated_probability': 0.7, 'reasoning': "r", 'confidence': 7},
+            'market': {'ticker': f"T{i}", 'question': "q", 'yes_price': 50}
+        }
+        for i in range(30)
+    ]
+    recs = strategic_math.get_advisor_recommendations(results)
+
+    assert len(recs) == strategic_math.DAILY_BUDGET_CENTS // strategic_math.MIN_BET_CENTS
+    assert all(float(r['suggested_bet'][1:]) * 100 >= strategic_math.MIN_BET_CENTS for r in recs)
+
+if __name__ == "__main__":
+    test_oversubscribed_budget_still_places_min_bets()
+    test_undersubscribed_budget_keeps_own_stakes()
+    test_bet_rounds_to_whole_cents_within_limit()
+    test_exact_min_edge_is_rejected()
+    test_advisor_keeps_only_edges_that_clear_the_min_bet()
+    print("✅ strategic_math checks passed.")